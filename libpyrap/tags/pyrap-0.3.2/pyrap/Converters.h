@@ -33,6 +33,7 @@
 #include <pyrap/Converters/PycRecord.h>
 #include <pyrap/Converters/PycValueHolder.h>
 #include <pyrap/Converters/PycExcp.h>
+#include <pyrap/Converters/PycGIL.h>
 
 
 namespace casa { //# NAMESPACE CASA - BEGIN
@@ -107,6 +107,20 @@ namespace casa { namespace pyrap {
     return d;
   }
 
+  template <>
+  object makeSharedPyArrayObject (casa::Array<String> const& arr)
+  {
+    return makePyArrayObject (arr);
+  }
+
+  object makePyStringArray (casa::Array<String> const& arr)
+  {
+    if (numpy::canImport()) {
+      return numpy::makePyStringArray (arr);
+    }
+    return makePyArrayObject (arr);
+  }
+
 
   // Instantiate the templates.
   template boost::python::object makePyArrayObject
@@ -130,4 +144,25 @@ namespace casa { namespace pyrap {
   template boost::python::object makePyArrayObject
     (casa::Array<DComplex> const& arr);
 
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Bool> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<uChar> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Short> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<uShort> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Int> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<uInt> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Float> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Double> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Complex> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<DComplex> const& arr);
+
 }}
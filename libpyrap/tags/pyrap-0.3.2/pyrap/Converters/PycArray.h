@@ -96,6 +96,24 @@ namespace casa { namespace pyrap {
   boost::python::object makePyArrayObject (casa::Array<String> const& arr);
   // </group>
 
+  // Make a numpy array sharing the data of the Array instead of copying it.
+  // It must only be used for an Array owning its data (i.e. not referencing
+  // the memory of a Python object) that is not used anymore by the caller,
+  // such as an Array just read from a table. The data are copied if they
+  // are shared with another Array or cannot be mapped one-to-one to numpy.
+  // <group>
+  template <typename T>
+  boost::python::object makeSharedPyArrayObject (casa::Array<T> const& arr);
+  template <>
+  boost::python::object makeSharedPyArrayObject
+    (casa::Array<String> const& arr);
+  // </group>
+
+  // Make a fixed-width numpy string array from the strings.
+  // It is usually faster to handle than the list made by makePyArrayObject.
+  // If numpy cannot be used, the list is returned.
+  boost::python::object makePyStringArray (casa::Array<String> const& arr);
+
   // Convert Array to Python.
   template <typename T>
   struct casa_array_to_python
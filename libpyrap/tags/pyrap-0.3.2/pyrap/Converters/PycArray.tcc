@@ -47,6 +47,16 @@ namespace casa { namespace pyrap {
     return numarray::makePyArrayObject (arr);
   }
 
+  template <typename T>
+  boost::python::object makeSharedPyArrayObject (casa::Array<T> const& arr)
+  {
+    if (numpy::isImported()
+    || (!numarray::isImported() && numpy::canImport())) {
+      return numpy::makeSharedPyArrayObject (arr);
+    }
+    return numarray::makePyArrayObject (arr);
+  }
+
 }}
 
 #endif
@@ -243,7 +243,7 @@
   {
     PyObject** dst = static_cast<PyObject**>(to);
     for (uInt i=0; i<nr; i++) {
-      dst[i] = PyString_FromString(from[i].chars());
+      dst[i] = PyString_FromStringAndSize(from[i].data(), from[i].size());
     }
   }
   void ArrayCopy<String>::fromPy (String* to, const void* from, uInt nr)
@@ -251,10 +251,19 @@
     using namespace boost::python;
     PyObject** src = (PyObject**)from;
     for (uInt i=0; i<nr; i++) {
-      handle<> py_elem_hdl(src[i]);
-      object py_elem_obj(py_elem_hdl);
-      extract<std::string> elem_proxy(py_elem_obj);
-      to[i] = elem_proxy();
+      // Plain strings are assigned directly; others are converted.
+      if (PyString_Check(src[i])) {
+	char* str;
+	Py_ssize_t slen;
+	PyString_AsStringAndSize (src[i], &str, &slen);
+	to[i].assign (str, slen);
+      } else {
+	// The array keeps its reference, so only borrow it.
+	handle<> py_elem_hdl(borrowed(src[i]));
+	object py_elem_obj(py_elem_hdl);
+	extract<std::string> elem_proxy(py_elem_obj);
+	to[i] = elem_proxy();
+      }
     }
   }
   Array<String> ArrayCopy<String>::toArray (const IPosition& shape,
@@ -265,25 +274,121 @@
     return arr;
   }
 
+  // Copy n elements of N bytes with the given stride.
+  template <int N>
+  inline char* copyStrided (char* to, const char* from,
+			    Int64 n, Int64 stride)
+  {
+    for (Int64 i=0; i<n; ++i) {
+      ::memcpy (to, from, N);
+      to   += N;
+      from += stride;
+    }
+    return to;
+  }
+
+  // Copy the elements of a python array in C order into contiguous storage.
+  // It is used for a non-contiguous, misaligned or byteswapped array, so
+  // the data are copied in a single pass without making a contiguous copy
+  // of the python array first.
+  // Byteswapped values are swapped in place; complex values per part.
+  void gatherArray (PyArrayObject* po, char* to)
+  {
+    int nd = po->nd;
+    int elsize = po->descr->elsize;
+    Int64 nr = 1;
+    for (int i=0; i<nd; ++i) {
+      nr *= po->dimensions[i];
+    }
+    if (nr == 0) {
+      return;
+    }
+    char* start = to;
+    // The last axis is the inner loop; iterate over the other axes.
+    Int64 n      = (nd == 0  ?  1 : po->dimensions[nd-1]);
+    Int64 stride = (nd == 0  ?  0 : po->strides[nd-1]);
+    std::vector<Int64> pos(nd, 0);
+    const char* from = po->data;
+    while (true) {
+      switch (elsize) {
+      case 1:
+	to = copyStrided<1> (to, from, n, stride);
+	break;
+      case 2:
+	to = copyStrided<2> (to, from, n, stride);
+	break;
+      case 4:
+	to = copyStrided<4> (to, from, n, stride);
+	break;
+      case 8:
+	to = copyStrided<8> (to, from, n, stride);
+	break;
+      case 16:
+	to = copyStrided<16> (to, from, n, stride);
+	break;
+      default:
+	for (Int64 i=0; i<n; ++i) {
+	  ::memcpy (to, from + i*stride, elsize);
+	  to += elsize;
+	}
+      }
+      int ax = nd-2;
+      for (; ax>=0; --ax) {
+	from += po->strides[ax];
+	if (++pos[ax] < po->dimensions[ax]) {
+	  break;
+	}
+	from -= pos[ax] * po->strides[ax];
+	pos[ax] = 0;
+      }
+      if (ax < 0) {
+	break;
+      }
+    }
+    if (PyArray_ISBYTESWAPPED(po)) {
+      int swapsize = elsize;
+      if (po->descr->type_num == NPY_COMPLEX64
+      ||  po->descr->type_num == NPY_COMPLEX128) {
+	swapsize /= 2;
+      } else if (po->descr->type_num == NPY_UNICODE) {
+	swapsize = 4;
+      }
+      if (swapsize > 1) {
+	for (char* p=start; p<to; p+=swapsize) {
+	  std::reverse (p, p+swapsize);
+	}
+      }
+    }
+  }
+
+  // Make a casacore array from the python array.
+  // If the python array has to be gathered, the data are copied directly
+  // into the new array if the element sizes match. Otherwise they are
+  // gathered into a temporary buffer and converted.
+  template <typename T>
+  Array<T> makeCasaArray (const IPosition& shp, PyArrayObject* po,
+			  bool gather, bool copy)
+  {
+    if (!gather) {
+      return ArrayCopy<T>::toArray (shp, po->data, copy);
+    }
+    typedef typename TypeConvTraits<T>::python_type PyType;
+    if (sizeof(T) == sizeof(PyType)) {
+      Array<T> arr(shp);
+      gatherArray (po, reinterpret_cast<char*>(arr.data()));
+      return arr;
+    }
+    Block<PyType> buf(shp.product());
+    gatherArray (po, reinterpret_cast<char*>(buf.storage()));
+    return ArrayCopy<T>::toArray (shp, buf.storage(), True);
+  }
+
   ValueHolder makeArray (PyObject* obj_ptr, Bool copyData)
   {
     if (! PycArrayCheck(obj_ptr)) {
       throw AipsError ("PycArray: python object is not an array");
     }
     PyArrayObject* po = (PyArrayObject*)obj_ptr;
-    boost::python::object obj;
-    bool docopy = copyData;               // copy data if wanted or needed
-    if (! PyArray_ISCONTIGUOUS(po)
-	||  ! PyArray_ISALIGNED(po)
-	||  PyArray_ISBYTESWAPPED(po)) {
-      boost::python::handle<> py_hdl(obj_ptr);
-      boost::python::object py_obj(py_hdl);
-      // incr refcount, because ~object decrements it
-      boost::python::incref(obj_ptr);
-      obj = py_obj.attr("copy")();
-      po = (PyArrayObject*)(obj.ptr());
-      docopy = true;
-    }
     // Swap axes, because AIPS++ has row minor and Python row major order.
     // A scalar is treated as a vector with length 1.
     int nd = po->nd;
@@ -294,66 +399,77 @@
 	shp[i] = po->dimensions[nd-i-1];
       }
     }
-    // Assert array is contiguous now.
+    // A non-contiguous, misaligned or byteswapped array has to be gathered
+    // into new storage; otherwise the data can be used directly.
     // If the array is empty, numarray still sees it as non-contiguous.
-    if (shp.product() > 0) {
-      AlwaysAssert (PyArray_ISCONTIGUOUS(po)
-		    &&  PyArray_ISALIGNED(po)
-		    &&  !PyArray_ISBYTESWAPPED(po), AipsError);
-    }
+    bool gather = (shp.product() > 0  &&
+		   (! PyArray_ISCONTIGUOUS(po)
+		    ||  ! PyArray_ISALIGNED(po)
+		    ||  PyArray_ISBYTESWAPPED(po)));
+    bool docopy = copyData;
     // Create the correct array.
     switch (po->descr->type_num) {
     case NPY_BOOL:
-      return ValueHolder (ArrayCopy<Bool>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<Bool>(shp, po, gather, docopy));
     case NPY_INT16:
-      return ValueHolder (ArrayCopy<Short>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<Short>(shp, po, gather, docopy));
     case NPY_UINT16:
-      return ValueHolder (ArrayCopy<uShort>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<uShort>(shp, po, gather, docopy));
     case NPY_INT32:
-      return ValueHolder (ArrayCopy<Int>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<Int>(shp, po, gather, docopy));
     case NPY_UINT32:
-      return ValueHolder (ArrayCopy<uInt>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<uInt>(shp, po, gather, docopy));
     case NPY_FLOAT32:
-      return ValueHolder (ArrayCopy<Float>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<Float>(shp, po, gather, docopy));
     case NPY_FLOAT64:
-      return ValueHolder (ArrayCopy<Double>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<Double>(shp, po, gather, docopy));
     case NPY_COMPLEX64:
-      return ValueHolder (ArrayCopy<Complex>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<Complex>(shp, po, gather, docopy));
     case NPY_COMPLEX128:
-      return ValueHolder (ArrayCopy<DComplex>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<DComplex>(shp, po, gather, docopy));
     case NPY_OBJECT:
-      return ValueHolder (ArrayCopy<String>::toArray(shp, po->data, docopy));
+      return ValueHolder (makeCasaArray<String>(shp, po, gather, docopy));
     default:
       // Some types can be the same as other types, so they cannot
       // be used in the switch (compiler complains).
       // This is true for BYTE and SBYTE which can equal to BOOL in numarray.
-      // Similarly for STRING which exists for numpy and is set to
-      // INT for numarray.
+      // Similarly for STRING and UNICODE which exist for numpy and are
+      // set to INT for numarray.
       if (po->descr->type_num == NPY_INT64) {
-	Array<Int64> arr = ArrayCopy<Int64>::toArray(shp, po->data, False);
+	Array<Int64> arr = makeCasaArray<Int64>(shp, po, gather, False);
 	Array<Int> res(arr.shape());
 	convertArray (res, arr);
 	return ValueHolder(res);
       } else if (po->descr->type_num == NPY_UINT64) {
-	Array<uInt64> arr = ArrayCopy<uInt64>::toArray(shp, po->data, False);
+	Array<uInt64> arr = makeCasaArray<uInt64>(shp, po, gather, False);
 	Array<uInt> res(arr.shape());
 	convertArray (res, arr);
 	return ValueHolder(res);
       } else if (po->descr->type_num == NPY_INT8) {
-	Array<Char> arr = ArrayCopy<Char>::toArray(shp, po->data, False);
+	Array<Char> arr = makeCasaArray<Char>(shp, po, gather, False);
 	Array<Short> res(arr.shape());
 	convertArray (res, arr);
 	return ValueHolder(res);
       } else if (po->descr->type_num == NPY_UINT8) {
 	// Copy using Char, because uChar is mapped to Short in the Traits.
-	Array<Char> arr = ArrayCopy<Char>::toArray(shp, po->data, False);
+	Array<Char> arr = makeCasaArray<Char>(shp, po, gather, False);
 	Array<Short> res(arr.shape());
 	convertArray (res, (const Array<uChar>&)arr);
 	return ValueHolder(res);
+      } else if (po->descr->type_num == NPY_UNICODE) {
+	int nchar = po->descr->elsize / 4;
+	if (gather) {
+	  Block<char> buf(shp.product() * po->descr->elsize);
+	  gatherArray (po, buf.storage());
+	  return ValueHolder (ArrayCopyUni_toArray(shp, buf.storage(), nchar));
+	}
+	return ValueHolder (ArrayCopyUni_toArray(shp, po->data, nchar));
       } else if (po->descr->type_num == NPY_STRING) {
-	int slen = 0;
-	if (nd > 0) {
-	  slen = po->strides[nd-1];
+	int slen = po->descr->elsize;
+	if (gather) {
+	  Block<char> buf(shp.product() * slen);
+	  gatherArray (po, buf.storage());
+	  return ValueHolder (ArrayCopyStr_toArray(shp, buf.storage(), slen));
 	}
 	return ValueHolder (ArrayCopyStr_toArray(shp, po->data, slen));
       }
@@ -40,6 +40,8 @@
   template <typename T>
   inline boost::python::object makePyArrayObject (casa::Array<T> const&)
     { return boost::python::object(); }
+  inline boost::python::object makePyStringArray (casa::Array<String> const&)
+    { return boost::python::object(); }
 
 #else
 
@@ -96,11 +98,22 @@
   };
   // </group>
 
+  // Convert a fixed-width python string array (with slen bytes per value)
+  // or unicode array (with nchar UCS4 characters per value) to an AIPS++
+  // array. Unicode strings are stored as UTF-8.
+  // <group>
   Array<String> ArrayCopyStr_toArray (const IPosition& shape,
 				      void* data, uInt slen);
+  Array<String> ArrayCopyUni_toArray (const IPosition& shape,
+				      void* data, uInt nchar);
+  // </group>
 
   // Convert an AIPS++ array to a Python array object.
   template <typename T>
   boost::python::object makePyArrayObject (casa::Array<T> const& arr);
 
+  // Convert an AIPS++ string array to a fixed-width python string array.
+  // Its width is the length of the longest string.
+  boost::python::object makePyStringArray (casa::Array<String> const& arr);
+
 #endif
@@ -31,6 +31,8 @@
 #include <casa/Arrays/ArrayMath.h>
 #include <casa/Utilities/Assert.h>
 #include <casa/Exceptions/Error.h>
+#include <casa/Containers/Block.h>
+#include <algorithm>
 #include <numarray/arrayobject.h>
 #include <boost/python/dict.hpp>
 
@@ -51,6 +53,7 @@
 #define NPY_COMPLEX128 PyArray_CDOUBLE
 #define NPY_OBJECT     PyArray_OBJECT
 #define NPY_STRING     PyArray_INT
+#define NPY_UNICODE    PyArray_INT
 
 // Make the numarray typedefs equal to those used in numpy.
 typedef ::Bool    npy_bool;
@@ -82,6 +85,17 @@ namespace casa { namespace pyrap { namespace numarray {
     throw AipsError ("PycArray: numarray string arrays are not supported");
   }
 
+  Array<String> ArrayCopyUni_toArray (const IPosition&,
+				      void*, uInt)
+  {
+    throw AipsError ("PycArray: numarray string arrays are not supported");
+  }
+
+  boost::python::object makePyStringArray (casa::Array<String> const&)
+  {
+    throw AipsError ("PycArray: numarray string arrays are not supported");
+  }
+
 #include <pyrap/Converters/PycArrayComCC.h>
 
   template <typename T>
@@ -31,6 +31,8 @@
 #include <casa/Arrays/ArrayMath.h>
 #include <casa/Utilities/Assert.h>
 #include <casa/Exceptions/Error.h>
+#include <casa/Containers/Block.h>
+#include <algorithm>
 #include <numpy/arrayobject.h>
 #include <boost/python/dict.hpp>
 
@@ -52,21 +54,96 @@ namespace casa { namespace pyrap { namespace numpy {
     // This code converts from a numpy String array.
     // The longest string determines the length of each value.
     // They are padded with zeroes if shorter.
+    // Each value is assigned in place, so no temporary String is made.
     Array<String> arr(shape);
     String* to = arr.data();
     const char* src = static_cast<const char*>(data);
     uInt nr = arr.size();
     for (uInt i=0; i<nr; ++i) {
-      if (src[slen-1] == 0) {
-	to[i] = String(src);
-      } else {
-	to[i] = String(src, slen);
-      }
+      const void* end = ::memchr (src, 0, slen);
+      to[i].assign (src, end==0 ? slen : static_cast<const char*>(end) - src);
       src += slen;
     }
     return arr;
   }
 
+  Array<String> ArrayCopyUni_toArray (const IPosition& shape,
+				      void* data, uInt nchar)
+  {
+    // This code converts from a numpy unicode array (in UCS4) to UTF-8.
+    // As for strings, the values are padded with zeroes if shorter.
+    Array<String> arr(shape);
+    String* to = arr.data();
+    const npy_ucs4* src = static_cast<const npy_ucs4*>(data);
+    uInt nr = arr.size();
+    std::string buf;
+    for (uInt i=0; i<nr; ++i) {
+      buf.clear();
+      for (uInt j=0; j<nchar  &&  src[j] != 0; ++j) {
+	npy_ucs4 c = src[j];
+	if (c < 0x80) {
+	  buf += char(c);
+	} else if (c < 0x800) {
+	  buf += char(0xc0 | (c >> 6));
+	  buf += char(0x80 | (c & 0x3f));
+	} else if (c < 0x10000) {
+	  buf += char(0xe0 | (c >> 12));
+	  buf += char(0x80 | ((c >> 6) & 0x3f));
+	  buf += char(0x80 | (c & 0x3f));
+	} else {
+	  buf += char(0xf0 | (c >> 18));
+	  buf += char(0x80 | ((c >> 12) & 0x3f));
+	  buf += char(0x80 | ((c >> 6) & 0x3f));
+	  buf += char(0x80 | (c & 0x3f));
+	}
+      }
+      to[i].assign (buf);
+      src += nchar;
+    }
+    return arr;
+  }
+
+  boost::python::object makePyStringArray (casa::Array<String> const& arr)
+  {
+    // Load the API if needed.
+    if (!PyArray_API) loadAPI();
+    // Determine the width of the strings.
+    uInt slen = 1;
+    Array<String>::const_iterator iterEnd = arr.end();
+    for (Array<String>::const_iterator iter=arr.begin();
+	 iter!=iterEnd; ++iter) {
+      if ((*iter).size() > slen) {
+	slen = (*iter).size();
+      }
+    }
+    // Swap axes, because AIPS++ has row minor and Python row major order.
+    int nd = arr.ndim();
+    vector<npy_intp> newshp(1, 0);
+    if (nd == 0) {
+      nd = 1;
+    } else {
+      newshp.resize (nd);
+      const IPosition& shp = arr.shape();
+      for (int i=0; i<nd; i++) {
+	newshp[i] = shp[nd-i-1];
+      }
+    }
+    PyArrayObject* po = (PyArrayObject*)PyArray_New
+      (&PyArray_Type, nd, &(newshp[0]), NPY_STRING, 0, 0, slen, 0, 0);
+    if (po == 0) {
+      throw AipsError ("PycArray: failed to allocate python array-object");
+    }
+    // Copy the strings, padded with zeroes.
+    char* to = po->data;
+    ::memset (to, 0, arr.size() * slen);
+    for (Array<String>::const_iterator iter=arr.begin();
+	 iter!=iterEnd; ++iter) {
+      ::memcpy (to, (*iter).data(), (*iter).size());
+      to += slen;
+    }
+    return boost::python::object(boost::python::handle<>((PyObject*)po));
+  }
+
   //# Code to deal with numpy array scalars (i.e. a value returned
   //# by taking an element from a numpy array).
 
@@ -258,8 +335,65 @@ namespace casa { namespace pyrap { namespace numpy {
 
 #include <pyrap/Converters/PycArrayComCC.h>
 
+  // Delete the casacore Array kept alive by a numpy array sharing its data.
+  // It is called when the base object of the numpy array is destroyed.
   template <typename T>
-  boost::python::object makePyArrayObject (casa::Array<T> const& arr)
+#if PY_VERSION_HEX >= 0x02070000
+  void deleteSharedArray (PyObject* capsule)
+  {
+    delete static_cast<Array<T>*>(PyCapsule_GetPointer (capsule, 0));
+  }
+#else
+  void deleteSharedArray (void* ptr)
+  {
+    delete static_cast<Array<T>*>(ptr);
+  }
+#endif
+
+  // Try to make a numpy array sharing the data of the casacore Array.
+  // The caller must guarantee that the Array owns its data (i.e. does not
+  // reference external memory like the data of a numpy array) and is not
+  // used anymore; only makeSharedPyArrayObject does so.
+  // Sharing is only possible if the data are contiguous, have the same size
+  // in casacore and numpy, and are not shared with another Array (otherwise
+  // a change in that Array would also change the numpy array).
+  // A copy of the Array object is kept alive in a capsule which is the
+  // base object of the numpy array, so the data are freed once the numpy
+  // array (and all views on it) are deleted.
+  // A null pointer is returned if the data cannot be shared.
+  template <typename T>
+  PyArrayObject* makeSharedPyArray (casa::Array<T> const& arr,
+				    int nd, npy_intp* shape)
+  {
+    if (sizeof(T) != sizeof(typename TypeConvTraits<T>::python_type)
+	||  arr.size() == 0  ||  !arr.contiguousStorage()
+	||  arr.nrefs() != 1) {
+      return 0;
+    }
+    Array<T>* copy = new Array<T>(arr);
+#if PY_VERSION_HEX >= 0x02070000
+    PyObject* base = PyCapsule_New (copy, 0, &deleteSharedArray<T>);
+#else
+    PyObject* base = PyCObject_FromVoidPtr (copy, &deleteSharedArray<T>);
+#endif
+    if (base == 0) {
+      delete copy;
+      throw AipsError ("PycArray: failed to create python capsule");
+    }
+    PyArrayObject* po = (PyArrayObject*)PyArray_SimpleNewFromData
+      (nd, shape, TypeConvTraits<T>::pyType(), copy->data());
+    if (po == 0) {
+      Py_DECREF (base);
+      throw AipsError ("PycArray: failed to allocate python array-object");
+    }
+    // The numpy array steals the reference to the base object.
+    po->base = base;
+    return po;
+  }
+
+  // Make the numpy array, sharing the data if told so and possible.
+  template <typename T>
+  boost::python::object makePyArray (casa::Array<T> const& arr, Bool share)
   {
     // Load the API if needed.
     if (!PyArray_API) loadAPI();
@@ -276,23 +410,63 @@ namespace casa { namespace pyrap { namespace numpy {
 	newshp[i] = shp[nd-i-1];
       }
     }
-    // Create the array from the shape.
-    PyArrayObject* po = (PyArrayObject*)PyArray_SimpleNew
-      (nd, &(newshp[0]), TypeConvTraits<T>::pyType());
-    if (po == 0) {
-      throw AipsError ("PycArray: failed to allocate python array-object");
+    // Share the data if possible to avoid a copy.
+    PyArrayObject* po = 0;
+    if (share) {
+      po = makeSharedPyArray (arr, nd, &(newshp[0]));
     }
-    // Copy the data to numarray.
-    if (arr.size() > 0) {
-      casa::Bool deleteIt;
-      const T* src = arr.getStorage(deleteIt);
-      ArrayCopy<T>::toPy (po->data, src, arr.size());
-      arr.freeStorage(src, deleteIt);
+    if (po == 0) {
+      // Create the array from the shape.
+      po = (PyArrayObject*)PyArray_SimpleNew
+	(nd, &(newshp[0]), TypeConvTraits<T>::pyType());
+      if (po == 0) {
+	throw AipsError ("PycArray: failed to allocate python array-object");
+      }
+      // Copy the data to numpy.
+      if (arr.size() > 0) {
+	casa::Bool deleteIt;
+	const T* src = arr.getStorage(deleteIt);
+	ArrayCopy<T>::toPy (po->data, src, arr.size());
+	arr.freeStorage(src, deleteIt);
+      }
     }
     // Return the python array.
     return boost::python::object(boost::python::handle<>((PyObject*)po));
   }
 
+  template <typename T>
+  boost::python::object makePyArrayObject (casa::Array<T> const& arr)
+  {
+    return makePyArray (arr, False);
+  }
+
+  template <typename T>
+  boost::python::object makeSharedPyArrayObject (casa::Array<T> const& arr)
+  {
+    return makePyArray (arr, True);
+  }
+
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Bool> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<uChar> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Short> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<uShort> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Int> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<uInt> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Float> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Double> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<Complex> const& arr);
+  template boost::python::object makeSharedPyArrayObject
+    (casa::Array<DComplex> const& arr);
+
 
 }}}
 
@@ -48,6 +48,19 @@ namespace casa { namespace pyrap { namespace numpy {
 #include <pyrap/Converters/PycArrayComH.h>
 #undef PYC_USE_PYARRAY
 
+#if defined(AIPS_USENUMPY)
+      // Convert an AIPS++ array to a numpy array sharing its data if
+      // possible (see casa::pyrap::makeSharedPyArrayObject).
+      template <typename T>
+      boost::python::object makeSharedPyArrayObject
+        (casa::Array<T> const& arr);
+#else
+      template <typename T>
+      inline boost::python::object makeSharedPyArrayObject
+        (casa::Array<T> const&)
+        { return boost::python::object(); }
+#endif
+
 
       //# Define functions to deal with numpy array scalars.
 #if defined(AIPS_USENUMPY)
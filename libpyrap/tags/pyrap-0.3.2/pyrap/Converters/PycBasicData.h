@@ -225,6 +225,25 @@ namespace casa { namespace pyrap {
       return boost::python::incref(makeobject(c).ptr());
     }
   };
+  // Make a Python list of strings from the given number of elements.
+  // The list is sized once and the strings are created directly,
+  // which is much faster than appending them one by one.
+  template <typename Iter>
+  boost::python::object makeStringList (Iter iter, uInt nr)
+  {
+    using namespace boost::python;
+    object result (handle<>(PyList_New(nr)));
+    for (uInt i=0; i<nr; ++i, ++iter) {
+      const std::string& value = *iter;
+      PyObject* str = PyString_FromStringAndSize (value.data(), value.size());
+      if (str == 0) {
+	throw_error_already_set();
+      }
+      PyList_SET_ITEM (result.ptr(), i, str);
+    }
+    return result;
+  }
+
   template <>
   struct to_list <casa::IPosition >
   {
@@ -268,13 +287,7 @@ namespace casa { namespace pyrap {
     typedef casa::Array <casa::String> ContainerType;
     static boost::python::object makeobject (ContainerType const& c)
     {
-      boost::python::list result;
-      ContainerType::const_iterator i = c.begin();
-      ContainerType::const_iterator iEnd = c.end();
-      for( ; i != iEnd; ++i) {
-	result.append((std::string const&)(*i));
-      }
-      return result;
+      return makeStringList (c.begin(), c.nelements());
     }
     static PyObject* convert (ContainerType const& c)
     {
@@ -287,13 +300,7 @@ namespace casa { namespace pyrap {
     typedef casa::Vector <casa::String> ContainerType;
     static boost::python::object makeobject (ContainerType const& c)
     {
-      boost::python::list result;
-      ContainerType::const_iterator i = c.begin();
-      ContainerType::const_iterator iEnd = c.end();
-      for( ; i != iEnd; ++i) {
-	result.append((std::string const&)(*i));
-      }
-      return result;
+      return makeStringList (c.begin(), c.nelements());
     }
     static PyObject* convert (ContainerType const& c)
     {
@@ -0,0 +1,77 @@
+//# PycGIL.h: Release the Python GIL during C++ operations
+//# Copyright (C) 2010
+//# Associated Universities, Inc. Washington DC, USA.
+//#
+//# This library is free software; you can redistribute it and/or modify it
+//# under the terms of the GNU Library General Public License as published by
+//# the Free Software Foundation; either version 2 of the License, or (at your
+//# option) any later version.
+//#
+//# This library is distributed in the hope that it will be useful, but WITHOUT
+//# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+//# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+//# License for more details.
+//#
+//# You should have received a copy of the GNU Library General Public License
+//# along with this library; if not, write to the Free Software Foundation,
+//# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+//#
+//# Correspondence concerning AIPS++ should be addressed as follows:
+//#        Internet email: aips2-request@nrao.edu.
+//#        Postal address: AIPS++ Project Office
+//#                        National Radio Astronomy Observatory
+//#                        520 Edgemont Road
+//#                        Charlottesville, VA 22903-2475 USA
+//#
+//# $Id$
+
+#ifndef PYRAP_PYCGIL_H
+#define PYRAP_PYCGIL_H
+
+// include python first to avoid _POSIX_C_SOURCE redefined warnings
+#include <boost/python.hpp>
+
+namespace casa { namespace pyrap {
+
+  // <summary>
+  // Release the Python GIL while an object of this class is alive.
+  // </summary>
+
+  // <synopsis>
+  // Creating a PycReleaseGIL object releases the global interpreter lock,
+  // so other Python threads can run while a lengthy C++ operation
+  // (e.g. reading a table column) is done. The destructor reacquires the
+  // lock, also if the operation throws an exception.
+  // No Python object can be used while the lock is released, so
+  // conversion of arguments and results must be done outside its scope.
+  // </synopsis>
+  // <example>
+  // <srcblock>
+  //   ValueHolder getColumn (TableProxy& self, const String& name)
+  //   {
+  //     PycReleaseGIL release;
+  //     return self.getColumn (name, 0, -1, 1);
+  //   }
+  // </srcblock>
+  // </example>
+  class PycReleaseGIL
+  {
+  public:
+    PycReleaseGIL()
+      : itsState (PyEval_SaveThread())
+    {}
+    ~PycReleaseGIL()
+      { PyEval_RestoreThread (itsState); }
+  private:
+    // Copying is not possible.
+    // <group>
+    PycReleaseGIL (const PycReleaseGIL&);
+    PycReleaseGIL& operator= (const PycReleaseGIL&);
+    // </group>
+
+    PyThreadState* itsState;
+  };
+
+}}
+
+#endif
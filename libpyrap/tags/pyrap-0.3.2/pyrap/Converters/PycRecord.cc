@@ -35,16 +35,53 @@ namespace casa { namespace pyrap {
   boost::python::dict casa_record_to_python::makeobject
   (Record const& rec)
   {
-    boost::python::dict d;
+    using namespace boost::python;
+    dict d;
     // Copy over the record field by field
     uInt nf = rec.nfields();
     for (uInt i=0; i<nf; i++) {
-      d.setdefault ((std::string const&)(rec.name(i)),
-		    casa_value_to_python::makeobject(rec.asValueHolder(i)));
+      object key (handle<>(PyString_InternFromString (rec.name(i).c_str())));
+      object value (makefield (rec, i));
+      if (PyDict_SetItem (d.ptr(), key.ptr(), value.ptr()) < 0) {
+	throw_error_already_set();
+      }
     }
     return d;
   }
 
+  boost::python::object casa_record_to_python::makefield
+  (Record const& rec, uInt fieldnr)
+  {
+    using namespace boost::python;
+    // Handle the most common types directly instead of via a ValueHolder.
+    PyObject* value = 0;
+    switch (rec.dataType(fieldnr)) {
+    case TpBool:
+      value = PyBool_FromLong (rec.asBool(fieldnr));
+      break;
+    case TpInt:
+      value = PyInt_FromLong (rec.asInt(fieldnr));
+      break;
+    case TpFloat:
+      value = PyFloat_FromDouble (rec.asFloat(fieldnr));
+      break;
+    case TpDouble:
+      value = PyFloat_FromDouble (rec.asDouble(fieldnr));
+      break;
+    case TpString:
+      {
+	const String& str = rec.asString(fieldnr);
+	value = PyString_FromStringAndSize (str.data(), str.size());
+      }
+      break;
+    case TpRecord:
+      return makeobject (rec.subRecord(fieldnr));
+    default:
+      return casa_value_to_python::makeobject (rec.asValueHolder(fieldnr));
+    }
+    return object(handle<>(value));
+  }
+
 
   void* casa_record_from_python::convertible(PyObject* obj_ptr)
   {
@@ -69,23 +106,105 @@ namespace casa { namespace pyrap {
   {
     using namespace boost::python;
     AlwaysAssert (PyDict_Check(obj_ptr), AipsError);
-    dict d = extract<dict>(obj_ptr)();
-    list keys = d.keys();
     Record result;
-    handle<> obj_iter(PyObject_GetIter(keys.ptr()));
-    std::size_t i=0;
-    for(;;i++) {
-      handle<> py_elem_hdl(allow_null(PyIter_Next(obj_iter.get())));
-      if (PyErr_Occurred()) throw_error_already_set();
-      if (!py_elem_hdl.get()) break;             // end of iteration
-      object py_elem_key(py_elem_hdl);
-      result.defineFromValueHolder (extract<string>(py_elem_key)(),
-           casa_value_from_python::makeValueHolder(d.get(py_elem_key).ptr()));
+    PyObject* key;
+    PyObject* value;
+    Py_ssize_t pos = 0;
+    // Iterate directly over the dict; key and value are borrowed.
+    while (PyDict_Next (obj_ptr, &pos, &key, &value)) {
+      String name;
+      if (PyString_Check(key)) {
+	name = String(PyString_AS_STRING(key), PyString_GET_SIZE(key));
+      } else {
+	name = extract<std::string>(key)();
+      }
+      // Handle the most common scalars directly.
+      if (PyBool_Check(value)) {
+	result.define (name, Bool(value == Py_True));
+      } else if (PyInt_Check(value)  &&
+		 PyInt_AS_LONG(value) == long(Int(PyInt_AS_LONG(value)))) {
+	result.define (name, Int(PyInt_AS_LONG(value)));
+      } else if (PyFloat_Check(value)) {
+	result.define (name, Double(PyFloat_AS_DOUBLE(value)));
+      } else if (PyString_Check(value)) {
+	result.define (name, String(PyString_AS_STRING(value),
+				    PyString_GET_SIZE(value)));
+      } else {
+	result.defineFromValueHolder
+	  (name, casa_value_from_python::makeValueHolder(value));
+      }
     }
     return result;
   }
 
 
+  boost::python::list PycRecordView::keys() const
+  {
+    using namespace boost::python;
+    list result;
+    uInt nf = itsRecord.nfields();
+    for (uInt i=0; i<nf; i++) {
+      result.append (object(handle<>
+			    (PyString_InternFromString
+			     (itsRecord.name(i).c_str()))));
+    }
+    return result;
+  }
+
+  boost::python::object PycRecordView::getitem (const String& name) const
+  {
+    using namespace boost::python;
+    Int fieldnr = itsRecord.fieldNumber (name);
+    if (fieldnr < 0) {
+      PyErr_SetString (PyExc_KeyError, name.c_str());
+      throw_error_already_set();
+    }
+    if (itsRecord.dataType(fieldnr) == TpRecord) {
+      return object (PycRecordView (itsRecord.subRecord(fieldnr)));
+    }
+    return casa_record_to_python::makefield (itsRecord, fieldnr);
+  }
+
+  boost::python::object PycRecordView::get
+  (const String& name, const boost::python::object& defval) const
+  {
+    if (! itsRecord.isDefined (name)) {
+      return defval;
+    }
+    return getitem (name);
+  }
+
+  // Iterate over the field names.
+  static boost::python::object recordViewIter (const PycRecordView& view)
+  {
+    return view.keys().attr("__iter__")();
+  }
+
+  // Show the contents as a dict.
+  static boost::python::object recordViewRepr (const PycRecordView& view)
+  {
+    return view.todict().attr("__repr__")();
+  }
+
+  void PycRecordView::makeClass()
+  {
+    using namespace boost::python;
+    class_<PycRecordView> ("recordview", no_init)
+      .def ("__len__", &PycRecordView::size)
+      .def ("__contains__", &PycRecordView::contains)
+      .def ("__getitem__", &PycRecordView::getitem)
+      .def ("__iter__", &recordViewIter)
+      .def ("__repr__", &recordViewRepr)
+      .def ("has_key", &PycRecordView::contains)
+      .def ("keys", &PycRecordView::keys)
+      .def ("get", &PycRecordView::get,
+	    (boost::python::arg("key"),
+	     boost::python::arg("default")=object()))
+      .def ("todict", &PycRecordView::todict)
+      ;
+  }
+
+
   bool convert_casa_record::_done = false;
   void convert_casa_record::reg()
   {
@@ -93,6 +212,7 @@ namespace casa { namespace pyrap {
       _done = true;
       boost::python::to_python_converter<Record, casa_record_to_python>();
       casa_record_from_python();
+      PycRecordView::makeClass();
     }
   }
 
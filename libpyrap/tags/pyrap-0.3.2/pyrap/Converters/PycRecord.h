@@ -49,9 +49,13 @@ namespace casa { namespace pyrap {
   // </synopsis>
 
   // convert casa::Record to PyDict
+  // The field names are interned Python strings.
+  // Scalars and subrecords are converted directly; other values through
+  // a ValueHolder.
   struct casa_record_to_python
   {
     static boost::python::dict makeobject (Record const& rec);
+    static boost::python::object makefield (Record const& rec, uInt fieldnr);
     static PyObject* convert (Record const& rec)
     {
       return boost::python::incref(makeobject(rec).ptr());
@@ -81,6 +85,53 @@ namespace casa { namespace pyrap {
   };
 
 
+  // <summary>
+  // A lazy read-only view of a Record in Python.
+  // </summary>
+  // <synopsis>
+  // It is a light-weight alternative to converting an entire Record to a
+  // dict. A field is only converted when it is accessed; a subrecord is
+  // returned as a view as well. It behaves as a read-only dict; method
+  // todict converts the entire Record to a dict.
+  // The Record is shared (copy-on-write), so making a view is cheap.
+  // </synopsis>
+  class PycRecordView
+  {
+  public:
+    explicit PycRecordView (const Record& rec)
+      : itsRecord (rec)
+    {}
+
+    // Get the number of fields.
+    uInt size() const
+      { return itsRecord.nfields(); }
+
+    // Test if the field exists.
+    Bool contains (const String& name) const
+      { return itsRecord.isDefined (name); }
+
+    // Get the field names.
+    boost::python::list keys() const;
+
+    // Get the value of a field. A KeyError is raised if it does not exist.
+    boost::python::object getitem (const String& name) const;
+
+    // Get the value of a field, or the default if it does not exist.
+    boost::python::object get (const String& name,
+                               const boost::python::object& defval) const;
+
+    // Convert the entire Record to a dict.
+    boost::python::dict todict() const
+      { return casa_record_to_python::makeobject (itsRecord); }
+
+    // Make the Python class (named recordview).
+    static void makeClass();
+
+  private:
+    Record itsRecord;
+  };
+
+
   // Register the Record conversion.
   struct convert_casa_record
   {
@@ -34,8 +34,19 @@
 
 namespace casa { namespace pyrap {
 
+  // Convert an array, possibly sharing its data.
+  template <typename T>
+  inline boost::python::object arrayToPython (Array<T> const& arr,
+                                              Bool share)
+  {
+    if (share) {
+      return makeSharedPyArrayObject (arr);
+    }
+    return casa_array_to_python<T>::makeobject (arr);
+  }
+
   boost::python::object casa_value_to_python::makeobject
-  (ValueHolder const& vh)
+  (ValueHolder const& vh, Bool shareArray)
   {
     if (vh.isNull()) {
       return boost::python::object(boost::python::handle<>(Py_None));
@@ -56,23 +67,23 @@ namespace casa { namespace pyrap {
     case TpString:
       return boost::python::object((std::string const&)(vh.asString()));
     case TpArrayBool:
-      return casa_array_to_python<Bool>::makeobject (vh.asArrayBool());
+      return arrayToPython (vh.asArrayBool(), shareArray);
     case TpArrayUChar:
-      return casa_array_to_python<uChar>::makeobject (vh.asArrayuChar());
+      return arrayToPython (vh.asArrayuChar(), shareArray);
     case TpArrayShort:
-      return casa_array_to_python<Short>::makeobject (vh.asArrayShort());
+      return arrayToPython (vh.asArrayShort(), shareArray);
     case TpArrayInt:
-      return casa_array_to_python<Int>::makeobject (vh.asArrayInt());
+      return arrayToPython (vh.asArrayInt(), shareArray);
     case TpArrayUInt:
-      return casa_array_to_python<uInt>::makeobject (vh.asArrayuInt());
+      return arrayToPython (vh.asArrayuInt(), shareArray);
     case TpArrayFloat:
-      return casa_array_to_python<Float>::makeobject (vh.asArrayFloat());
+      return arrayToPython (vh.asArrayFloat(), shareArray);
     case TpArrayDouble:
-      return casa_array_to_python<Double>::makeobject (vh.asArrayDouble());
+      return arrayToPython (vh.asArrayDouble(), shareArray);
     case TpArrayComplex:
-      return casa_array_to_python<Complex>::makeobject (vh.asArrayComplex());
+      return arrayToPython (vh.asArrayComplex(), shareArray);
     case TpArrayDComplex:
-      return casa_array_to_python<DComplex>::makeobject (vh.asArrayDComplex());
+      return arrayToPython (vh.asArrayDComplex(), shareArray);
     case TpArrayString:
       return casa_array_to_python<String>::makeobject (vh.asArrayString());
     case TpRecord:
@@ -52,7 +52,12 @@ namespace casa { namespace pyrap {
 
   struct casa_value_to_python
   {
-    static boost::python::object makeobject (ValueHolder const&);
+    // Convert the value to a Python object.
+    // If shareArray=True, a numpy array can share the data of an array
+    // in the ValueHolder (see makeSharedPyArrayObject). It should only be
+    // used if the array has just been created (e.g. read from a table).
+    static boost::python::object makeobject (ValueHolder const&,
+                                             Bool shareArray=False);
     static PyObject* convert (ValueHolder const& c)
     {
       return boost::python::incref(makeobject(c).ptr());
@@ -57,6 +57,11 @@ namespace casa { namespace pyrap {
       {cout << "Record " << in.nfields() << endl; return in;}
     ValueHolder testvh (const ValueHolder& in)
       {cout << "VH " << in.dataType() << endl; return in;}
+    // Return a new Array the way the table and image read functions do.
+    object testvhshare (const ValueHolder& in)
+      {cout << "VHshare " << in.dataType() << endl;
+       ValueHolder vh(in.asArrayInt().copy());
+       return casa_value_to_python::makeobject (vh, True);}
     Vector<Int> testvecint (const Vector<int>& in)
       {cout << "VecInt " << in << endl; return in;}
     Vector<DComplex> testveccomplex (const Vector<DComplex>& in)
@@ -83,6 +88,7 @@ namespace casa { namespace pyrap {
       .def ("teststring",     &TConvert::teststring)
       .def ("testrecord",     &TConvert::testrecord)
       .def ("testvh",         &TConvert::testvh)
+      .def ("testvhshare",    &TConvert::testvhshare)
       .def ("testvecint",     &TConvert::testvecint)
       .def ("testveccomplex", &TConvert::testveccomplex)
       .def ("testvecstr",     &TConvert::testvecstr)
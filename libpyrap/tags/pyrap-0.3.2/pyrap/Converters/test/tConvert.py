@@ -68,6 +68,18 @@ def dotest(t):
     print t.testvh(NUM.array([20.+10j]));
     print t.testvh(NUM.array(21.));
 
+    # The result must not share the data of the input array.
+    b = NUM.int32([1,2,3]);
+    a = t.testvh (b);
+    a[0] = 10;
+    print b;
+    del b;
+    print a;
+    # A new Array can be shared.
+    a = t.testvhshare (NUM.int32([4,5,6]));
+    a[1] = 7;
+    print a;
+
     print '>>>';
     res = t.testvh (NUM.array([]));
     print '<<<';
@@ -133,6 +145,13 @@ def testnp():
     print '<<<';
     print res.shape;
     print t.testvh(NUM.array([["abcd","c"],["12","x12"]]));
+    # Test non-contiguous and byteswapped arrays.
+    b = NUM.int32([[1,2,3],[4,5,6]]);
+    print t.testvh(b.transpose());
+    print t.testvh(b[:,::2]);
+    print t.testvh(b.byteswap().newbyteorder());
+    # Test a unicode array (converted to UTF-8).
+    print t.testvh(NUM.array([u"ab", u"\xe9"]));
     testnps();
 
 def testna():
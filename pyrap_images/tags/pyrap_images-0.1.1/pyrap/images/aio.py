@@ -0,0 +1,66 @@
+# aio.py: asyncio interface to image data access
+# Copyright (C) 2010
+# Associated Universities, Inc. Washington DC, USA.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Library General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+# License for more details.
+#
+# You should have received a copy of the GNU Library General Public License
+# along with this library; if not, write to the Free Software Foundation,
+# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+#
+# Correspondence concerning AIPS++ should be addressed as follows:
+#        Internet email: aips2-request@nrao.edu.
+#        Postal address: AIPS++ Project Office
+#                        National Radio Astronomy Observatory
+#                        520 Edgemont Road
+#                        Charlottesville, VA 22903-2475 USA
+#
+# $Id$
+
+"""Awaitable versions of the image data access functions.
+
+The functions run the corresponding :class:`image` method in a bounded
+thread pool (see :mod:`pyrap.util.aio`) and return an asyncio future.
+In this way an asyncio based program can read or write image data without
+blocking its event loop. For example::
+
+  from pyrap.images import image
+  import pyrap.images.aio as iaio
+  from pyrap.util.aio import asyncio
+
+  im = image('3c343.img')
+  loop = asyncio.get_event_loop()
+  data = loop.run_until_complete (iaio.getdata (im, [0,0], [9,9]))
+
+Calls on the same image object are done one after another, because an
+image object cannot be used by multiple threads at the same time.
+The maximum number of threads can be set with :func:`setmaxworkers`.
+
+"""
+
+from pyrap.util.aio import run, setmaxworkers
+
+
+def getdata (im, blc=(), trc=(), inc=()):
+    """Awaitable version of :func:`image.getdata`."""
+    return run (im, im.getdata, blc, trc, inc)
+
+def getmask (im, blc=(), trc=(), inc=()):
+    """Awaitable version of :func:`image.getmask`."""
+    return run (im, im.getmask, blc, trc, inc)
+
+def putdata (im, value, blc=(), trc=(), inc=()):
+    """Awaitable version of :func:`image.putdata`."""
+    return run (im, im.putdata, value, blc, trc, inc)
+
+def putmask (im, value, blc=(), trc=(), inc=()):
+    """Awaitable version of :func:`image.putmask`."""
+    return run (im, im.putmask, value, blc, trc, inc)
@@ -207,7 +207,7 @@ class image(Image):
         """Get data type of the image."""
         return self._datatype()
 
-    def getdata (self, blc=(), trc=(), inc=()):
+    def getdata (self, blc=(), trc=(), inc=(), out=None):
         """Get image data.
 
         Using the arguments blc (bottom left corner), trc (top right corner),
@@ -216,7 +216,26 @@ class image(Image):
         The data is returned as a numpy array. Its dimensionality is the same
         as the dimensionality of the image, even if an axis has length 1.
 
+        If `out` is given, the data are read into that numpy array which is
+        also returned. It must be a writable contiguous array in native byte
+        order with the data type of the image and the shape of the slice.
+        It avoids allocating a new array when reading many slices.
+
         """
+        if out is not None:
+            if not isinstance(out, numpy.ndarray):
+                raise TypeError ('out must be a numpy array')
+            if out.dtype not in (numpy.float32, numpy.float64,
+                                 numpy.complex64, numpy.complex128):
+                raise TypeError ('out cannot have data type ' + str(out.dtype))
+            if not (out.flags.c_contiguous  and  out.flags.aligned  and
+                    out.flags.writeable  and  out.dtype.isnative):
+                raise ValueError ('out must be a writable contiguous array ' +
+                                  'in native byte order')
+            self._getdataout (self._adjustBlc(blc),
+                              self._adjustTrc(trc),
+                              self._adjustInc(inc), out)
+            return out
         return self._getdata (self._adjustBlc(blc),
                               self._adjustTrc(trc),
                               self._adjustInc(inc));
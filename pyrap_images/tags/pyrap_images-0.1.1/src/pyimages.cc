@@ -26,9 +26,12 @@
 //# $Id$
 
 #include <images/Images/ImageProxy.h>
+#include <lattices/Lattices/Lattice.h>
+#include <casa/Arrays/Slicer.h>
 #include <pyrap/Converters/PycBasicData.h>
 #include <pyrap/Converters/PycValueHolder.h>
 #include <pyrap/Converters/PycRecord.h>
+#include <pyrap/Converters/PycGIL.h>
 #include <boost/python.hpp>
 #include <boost/python/args.hpp>
 
@@ -36,6 +39,95 @@ using namespace boost::python;
 
 namespace casa { namespace pyrap {
 
+  // The following functions release the GIL while reading or writing
+  // the data, so other Python threads can continue meanwhile.
+  // Note that an image object itself cannot be used by multiple threads
+  // at the same time.
+  // The numpy array returned shares the data read unless they are still
+  // referenced by the image (e.g. a temporary image held in memory).
+  object getData (ImageProxy& self, const IPosition& blc,
+                  const IPosition& trc, const IPosition& inc)
+  {
+    ValueHolder vh;
+    {
+      PycReleaseGIL release;
+      vh = self.getData (blc, trc, inc);
+    }
+    return casa_value_to_python::makeobject (vh, True);
+  }
+
+  object getMask (ImageProxy& self, const IPosition& blc,
+                  const IPosition& trc, const IPosition& inc)
+  {
+    ValueHolder vh;
+    {
+      PycReleaseGIL release;
+      vh = self.getMask (blc, trc, inc);
+    }
+    return casa_value_to_python::makeobject (vh, True);
+  }
+
+  // Read the data into an array referencing the data of a contiguous
+  // numpy array given by the caller, so no new array is allocated.
+  // If the lattice returns a reference to its internal data, those are
+  // copied into the output array.
+  template <typename T>
+  void getDataInto (const LatticeBase* lattice, const Slicer& slicer,
+                    const Array<T>& out)
+  {
+    const Lattice<T>* lat = dynamic_cast<const Lattice<T>*>(lattice);
+    if (lat == 0) {
+      throw AipsError ("Data type of output array mismatches image");
+    }
+    if (! out.shape().isEqual (slicer.length())) {
+      throw AipsError ("Shape of output array mismatches the image slice");
+    }
+    Array<T> arr(out);
+    if (lat->getSlice (arr, slicer)) {
+      Array<T> res(out);
+      res = arr;
+    }
+  }
+
+  void getDataOut (ImageProxy& self, const IPosition& blc,
+                   const IPosition& trc, const IPosition& inc,
+                   const ValueHolder& out)
+  {
+    PycReleaseGIL release;
+    const LatticeBase* lattice = self.getLattice();
+    Slicer slicer (blc, trc, inc, Slicer::endIsLast);
+    switch (out.dataType()) {
+    case TpArrayFloat:
+      getDataInto (lattice, slicer, out.asArrayFloat());
+      break;
+    case TpArrayDouble:
+      getDataInto (lattice, slicer, out.asArrayDouble());
+      break;
+    case TpArrayComplex:
+      getDataInto (lattice, slicer, out.asArrayComplex());
+      break;
+    case TpArrayDComplex:
+      getDataInto (lattice, slicer, out.asArrayDComplex());
+      break;
+    default:
+      throw AipsError ("Data type of output array mismatches image");
+    }
+  }
+
+  void putData (ImageProxy& self, const ValueHolder& value,
+                const IPosition& blc, const IPosition& inc)
+  {
+    PycReleaseGIL release;
+    self.putData (value, blc, inc);
+  }
+
+  void putMask (ImageProxy& self, const ValueHolder& value,
+                const IPosition& blc, const IPosition& inc)
+  {
+    PycReleaseGIL release;
+    self.putMask (value, blc, inc);
+  }
+
   void pyimages()
   {
     // Note that all constructors must have a different number of arguments.
@@ -64,10 +156,11 @@ namespace casa { namespace pyrap {
       .def ("_ndim", &ImageProxy::ndim)
       .def ("_size", &ImageProxy::size)
       .def ("_datatype", &ImageProxy::dataType)
-      .def ("_getdata", &ImageProxy::getData)
-      .def ("_getmask", &ImageProxy::getMask)
-      .def ("_putdata", &ImageProxy::putData)
-      .def ("_putmask", &ImageProxy::putMask)
+      .def ("_getdata", &getData)
+      .def ("_getdataout", &getDataOut)
+      .def ("_getmask", &getMask)
+      .def ("_putdata", &putData)
+      .def ("_putmask", &putMask)
       .def ("_haslock", &ImageProxy::hasLock,
  	    (boost::python::arg("write")))
       .def ("_lock", &ImageProxy::lock,
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+
+# Test pyrap.images.aio. It needs asyncio (or trollius on Python 2).
+
+from pyrap.images import *
+from pyrap.util.aio import asyncio
+import numpy
+import sys
+
+if asyncio is None:
+    print 'asyncio is not available'
+    sys.exit(0)
+import pyrap.images.aio as iaio
+
+# Make two images
+im = image("", shape=[4,3])
+im.put (numpy.array([[1,2,3],[4,5,6],[7,8,9],[10,11,12]]))
+im2 = image("", shape=[2,2])
+im2.put (numpy.array([[21,22],[23,24]]))
+loop = asyncio.get_event_loop()
+# Calls on the same image are done in order
+futs = [iaio.getdata (im, (0,0), (1,1)),
+        iaio.putdata (im, numpy.zeros((2,2)), (0,0)),
+        iaio.getdata (im, (0,0), (1,1)),
+        iaio.getmask (im, (0,0), (1,1)),
+        iaio.getdata (im2)]
+res = loop.run_until_complete (asyncio.gather (*futs))
+print res[0]
+print res[2]
+print res[3]
+print res[4]
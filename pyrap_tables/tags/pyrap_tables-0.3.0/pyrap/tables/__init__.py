@@ -50,6 +50,16 @@ The `tables` module consists of a few classes:
   iterate through a table based on the contents of one or more columns
 :class:`tableindex`
   build and use an index on one or more table columns
+:class:`tablehashindex`
+  build and use a hash index for fast lookups of equal keys
+:class:`tablefileindex`
+  build and use an index stored with the table
+:class:`tablecursor`
+  page through the rows selected by a query
+:class:`tablekeywords`
+  lazy dict-like access to the keywords of a table or column
+:class:`tablecache`
+  cache of open tables to avoid reopening them
 submodule `tableutil <#utility-functions>`_
   utility functions (e.g. to create a table description)
 
@@ -60,6 +70,11 @@ from table import tablecommand
 from table import taql
 from tableiter import tableiter
 from tableindex import tableindex
+from tablehashindex import tablehashindex
+from tablefileindex import tablefileindex
 from tablecolumn import tablecolumn
 from tablerow import tablerow
+from tablecursor import tablecursor
+from tablekeywords import tablekeywords
+from tablecache import tablecache, defaulttablecache
 from tableutil import *
@@ -0,0 +1,78 @@
+# aio.py: asyncio interface to table data access
+# Copyright (C) 2010
+# Associated Universities, Inc. Washington DC, USA.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Library General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+# License for more details.
+#
+# You should have received a copy of the GNU Library General Public License
+# along with this library; if not, write to the Free Software Foundation,
+# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+#
+# Correspondence concerning AIPS++ should be addressed as follows:
+#        Internet email: aips2-request@nrao.edu.
+#        Postal address: AIPS++ Project Office
+#                        National Radio Astronomy Observatory
+#                        520 Edgemont Road
+#                        Charlottesville, VA 22903-2475 USA
+#
+# $Id$
+
+"""Awaitable versions of the table data access functions.
+
+The functions run the corresponding :class:`table` method in a bounded
+thread pool (see :mod:`pyrap.util.aio`) and return an asyncio future.
+In this way an asyncio based program (e.g. a web service) can read or
+write table data without blocking its event loop. For example::
+
+  from pyrap.tables import table
+  import pyrap.tables.aio as taio
+  from pyrap.util.aio import asyncio
+
+  t1 = table('3c343.MS')
+  t2 = table('3c343.MS')
+  f1 = taio.getcol (t1, 'TIME', 0, 1000)
+  f2 = taio.getcol (t2, 'TIME', 1000, 1000)
+  loop = asyncio.get_event_loop()
+  (time1, time2) = loop.run_until_complete (asyncio.gather (f1, f2))
+
+Calls on the same table object are done one after another, because a
+table object cannot be used by multiple threads at the same time. Open
+the table multiple times to read it concurrently (as done above).
+The maximum number of threads can be set with :func:`setmaxworkers`.
+
+"""
+
+from pyrap.util.aio import run, setmaxworkers
+
+
+def getcol (t, columnname, startrow=0, nrow=-1, rowincr=1):
+    """Awaitable version of :func:`table.getcol`."""
+    return run (t, t.getcol, columnname, startrow, nrow, rowincr)
+
+def getcolslice (t, columnname, blc, trc, inc=[],
+                 startrow=0, nrow=-1, rowincr=1):
+    """Awaitable version of :func:`table.getcolslice`."""
+    return run (t, t.getcolslice, columnname, blc, trc, inc,
+                startrow, nrow, rowincr)
+
+def getcell (t, columnname, rownr):
+    """Awaitable version of :func:`table.getcell`."""
+    return run (t, t.getcell, columnname, rownr)
+
+def putcol (t, columnname, value, startrow=0, nrow=-1, rowincr=1):
+    """Awaitable version of :func:`table.putcol`."""
+    return run (t, t.putcol, columnname, value, startrow, nrow, rowincr)
+
+def putcolslice (t, columnname, value, blc, trc, inc=[],
+                 startrow=0, nrow=-1, rowincr=1):
+    """Awaitable version of :func:`table.putcolslice`."""
+    return run (t, t.putcolslice, columnname, value, blc, trc, inc,
+                startrow, nrow, rowincr)
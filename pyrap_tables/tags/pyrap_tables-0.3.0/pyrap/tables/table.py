@@ -41,7 +41,11 @@ Several utility functions exist. Important ones are:
 
 
 # Make interface to class TableProxy available.
-from _tables import Table
+from _tables import Table, _taqlcolumns
+import numpy
+import threading
+import time
+import weakref
 
 # A keywordset in a table can hold tables, but it is not possible to
 # pass them around because a ValueHolder cannot deal with it.
@@ -64,9 +68,111 @@ def _remove_prefix (name):
         return _do_remove_prefix (name)
     return [_do_remove_prefix(nm) for nm in name]
 
+def _isrownrs (startrow):
+    """Tell if a start row is given as a sequence of row numbers."""
+    return hasattr(startrow, '__len__')
+
+# The numpy types that can be read in place (they map one-to-one to a
+# casacore data type).
+_outtypes = [numpy.dtype(x) for x in ('bool', 'int16', 'uint16', 'int32',
+                                      'uint32', 'float32', 'float64',
+                                      'complex64', 'complex128')]
+
+# The numpy type a column can be read into in place (see _outtypes) for
+# each column data type (as given by table.coldatatype).
+_coloutypes = {'boolean': 'bool', 'short': 'int16', 'ushort': 'uint16',
+               'int': 'int32', 'uint': 'uint32', 'float': 'float32',
+               'double': 'float64', 'complex': 'complex64',
+               'dcomplex': 'complex128'}
+
+def _checkout (out):
+    """Check if data can be read into the given output array."""
+    if not isinstance(out, numpy.ndarray):
+        raise TypeError ('out must be a numpy array')
+    if out.dtype not in _outtypes:
+        raise TypeError ('out cannot have data type ' + str(out.dtype))
+    if not (out.flags.c_contiguous  and  out.flags.aligned  and
+            out.flags.writeable  and  out.dtype.isnative):
+        raise ValueError ('out must be a writable contiguous array ' +
+                          'in native byte order')
+
+
+class _readahead:
+    """Call a function in a background thread.
+
+    It is used to prefetch data. Method get waits for the function to
+    finish and returns its result (or raises its exception).
+
+    """
+    def __init__ (self, func, *args):
+        self._result = None;
+        self._error  = None;
+        self._thread = threading.Thread (target=self._run, args=(func, args));
+        self._thread.setDaemon (True);
+        self._thread.start();
+
+    def _run (self, func, args):
+        try:
+            self._result = func(*args);
+        except:
+            import sys
+            self._error = sys.exc_info();
+
+    def wait (self):
+        """Wait for the function to finish (ignoring its result)."""
+        self._thread.join();
+
+    def get (self):
+        self._thread.join();
+        if self._error is not None:
+            raise self._error[0], self._error[1], self._error[2]
+        return self._result;
+
+
+# The number of data changes made in this process per table, keyed by the
+# name of the (root) table holding the data. It makes it possible for a table
+# object to find out that its data have been changed via another table object
+# in this process (e.g. a reference table made by query, another table object
+# of the same table, or a TaQL UPDATE command). See table._syncprocversion.
+_procversions = {}
+_proclock = threading.Lock()
+
+def _bumpprocversions (names):
+    """Count a data change in the tables with the given names."""
+    _proclock.acquire()
+    try:
+        for name in names:
+            _procversions[name] = _procversions.get(name, 0) + 1
+    finally:
+        _proclock.release()
+
+def _ismodifycommand (command):
+    """Tell if a TaQL command can change the data of its tables."""
+    words = command.split(None, 3)
+    if len(words) > 3  and  words[0].lower() == 'using'  and  \
+           words[1].lower() == 'style':
+        words = words[3].split(None, 1)
+    return len(words) > 0  and  words[0].lower() in ('update', 'insert',
+                                                     'delete')
+
+
+# The table used by a worker process of table.parallel_iter.
+_workertable = None
+
+def _parallel_init (tablename):
+    """Open the table (readonly) in a worker process of parallel_iter."""
+    global _workertable
+    _workertable = table (tablename, ack=False)
+
+def _parallel_call (args):
+    """Apply the function to a group of rows in a worker process."""
+    func, rownrs = args
+    return func (_workertable.selectrows (rownrs))
+
 
 # Execute a TaQL command on a table.
-def taql (command, style='Python', tables=[], globals={}, locals={}):
+def taql (command, style='Python', tables=[], globals={}, locals={},
+          asdict=False):
     """Execute a TaQL command and return a table object.
 
     A `TaQL <../../casacore/doc/notes/199.html>`_
@@ -99,6 +205,17 @@ def taql (command, style='Python', tables=[], globals={}, locals={}):
     If `locals` is empty, the local variables in the calling function will
     be used, so normally one does not need to use these arguments.
 
+    If `asdict=True`, the result of a selection is not returned as a table,
+    but as a dict containing the data of each column in the result (as
+    returned by :func:`getcol` or :func:`getvarcol`). The data are read
+    in C++ directly from the result, so no table object is made and no
+    separate getcol calls are needed. It is useful for selections with
+    expression columns, such as::
+
+      res = taql('select gmean(TIME) as T, gsum(nfalse(FLAG)) as N ' +
+                 'from $t groupby ANTENNA1', asdict=True)
+      print res['T'], res['N']
+
     """
     # Substitute possible tables given as $name.
     cmd = command;
@@ -116,7 +233,19 @@ def taql (command, style='Python', tables=[], globals={}, locals={}):
         pass
     if style:
         cmd = 'using style ' + style + ' ' + cmd
+    if asdict:
+        result = _taqlcolumns (cmd, tabs)
+        if result.has_key('columns'):
+            return result['columns']
+        return result['values']
     tab = table(cmd, tabs, _oper=2)
+    if _ismodifycommand (command):
+        # Let the tables used know that their data have changed.
+        names = []
+        for t in tabs + [tab]:
+            if isinstance(t, table):
+                names += t._rootnames()
+        _bumpprocversions (set(names))
     result = tab._getcalcresult()
     # If result is empty, it was a normal TaQL command resulting in a table.
     # Otherwise it is a record containing calc values.
@@ -220,6 +349,12 @@ class table(Table):
       Non-mentioned subtables are considered to be identical in each table,
       so only the subtable of the first table is used as subtable for the
       concatenated table.
+    `concatthreads`
+      if tables are concatenated, the number of threads to use to read the
+      parts concurrently in :func:`getcol` and :func:`getcolslice`
+      (default 0 means no concurrent reading). The parts are read directly
+      into a single result array. It can make reading much faster if the
+      parts are on different disks or if the data are cached.
 
     Locking/unlocking to share a table in a concurrent environment is
     controlled by the lockoptions argument.
@@ -260,11 +395,39 @@ class table(Table):
       t = table('3c343.ms', readonly=False)  # open table read/write
       t1= table('new.tab', t.getdesc())      # create table
       t = table([t1,t2,t3,t4])               # concatenate 4 tables
+      t = table([t1,t2,t3,t4], concatthreads=4)  # read parts in parallel
 
     """
+
+    # Incremented when a keyword is changed, so lazy keyword objects
+    # (see :class:`tablekeywords`) know they have to clear their cache.
+    _kwversion = 0
+
+    # The parts of a concatenated table to be read by multiple threads.
+    _concatparts   = []
+    _concatthreads = 0
+
+    # Weak references to the indexes on this table, so they can be told
+    # when the table changes.
+    _indexes = []
+
+    # Incremented when the table data change (see _putdone); it is used
+    # to invalidate the cached query results. _extversion counts the
+    # changes made by other processes (see _syncdataversion).
+    # _procseen is the sum of the process-wide versions of the root tables
+    # (see _procversions) at the last check.
+    _dataversion    = 0
+    _procseen       = 0
+    _roots          = None
+    _extversion     = 0
+    _extseen        = 0
+    _extpolltime    = 0.
+    _querycache     = None
+    _querycachesize = 32
+
     def __init__(self, tablename, tabledesc=False, nrow=0, readonly=True,
                  lockoptions='default', ack=True, dminfo={}, endian='aipsrc',
-                 memorytable=False, concatsubtables=[],
+                 memorytable=False, concatsubtables=[], concatthreads=0,
                  _columnnames=[], _datatypes=[],
                  _oper=0, _delete=False):
         """Open or create a table."""
@@ -322,15 +485,25 @@ class table(Table):
                 elif isinstance(tabname[0],str):
                     # Concatenate and open named tables.
                     Table.__init__ (self, tabname, concatsubtables, lockopt, opt)
+                    if concatthreads > 0:
+                        self._concatthreads = concatthreads
+                        self._concatparts = [table(name, readonly=readonly,
+                                                   lockoptions=lockoptions,
+                                                   ack=False)
+                                             for name in tabname]
                     if ack:
                         print 'Successful', typstr, 'open of', lockopt['option']+'-locked concatenated tables', tabname,':', self.ncols(), 'columns,', self.nrows(), 'rows';
                 else:
                     # Concatenate already open tables.
                     Table.__init__ (self, tabname, concatsubtables, 0, 0, 0)
+                    if concatthreads > 0:
+                        self._concatthreads = concatthreads
+                        self._concatparts = list(tabname)
                     if ack:
                         print 'Successful virtual concatenation of', len(tabname), 'tables:', self.ncols(), 'columns,', self.nrows(), 'rows';
         # Create a row object for this table.
         self._makerow()
+        self._procseen = self._procversion()
 
     def _makerow (self):
         """Internal method to make its tablerow object."""
@@ -347,11 +520,11 @@ class table(Table):
 
     def __getitem__ (self, key):
         """Get the values from one or more rows."""
-        return self._row._getitem (key, self.nrows());
+        return self._row._getitem (self, key);
 
     def __setitem__ (self, key, value):
         """Put value into one or more row."""
-        self._row._setitem (key, value, self.nrows());
+        self._row._setitem (self, key, value);
 
     def col (self, columnname):
         """Return a tablecolumn object for the given column.
@@ -404,7 +577,260 @@ class table(Table):
         from tableiter import tableiter;
         return tableiter (self, columnnames, order, sort);
 
-    def index (self, columnnames, sort=True):
+    def groupby (self, columnnames, order='', sort=True):
+        """Group the rows of a table on the values of the given columns.
+
+        It divides the table into the same groups as :func:`iter`, but
+        instead of creating a reference table per group, it returns a tuple
+        `(keys, offsets, rownrs)` at once:
+
+        - a dict containing per column a numpy array with the key value of
+          each group.
+        - the offsets of the groups in the row number array. Group i
+          consists of the row numbers `rownrs[offsets[i]:offsets[i+1]]`,
+          so the length is the number of groups plus one.
+        - the row numbers of the rows in the groups.
+
+        It is much faster than iterating if there are many small groups.
+        The key columns are read in a single call and the grouping is done
+        using numpy. The columns must contain scalar values.
+        `order` and `sort` have the same meaning as in :func:`iter`.
+        If `sort=False`, a group is formed by consecutive rows with equal
+        values.
+
+        For example, average the DATA per time stamp::
+
+          t = table('3c343.MS')
+          keys, offsets, rownrs = t.groupby('TIME')
+          data = t.getcol('DATA')
+          for i in range(len(keys['TIME'])):
+            avg = data[rownrs[offsets[i]:offsets[i+1]]].mean(axis=0)
+
+        """
+        if isinstance(columnnames, str):
+            columnnames = [columnnames]
+        values = self._getcols (columnnames, 0, -1, 1)
+        cols = [numpy.asarray(values[name]) for name in columnnames]
+        for i in range(len(cols)):
+            if cols[i].ndim != 1:
+                raise ValueError ('groupby column ' + columnnames[i] +
+                                  ' must contain scalar values')
+        nrow = self.nrows()
+        if sort:
+            # lexsort is stable and uses the last key as the primary key.
+            rownrs = numpy.lexsort (cols[::-1])
+        else:
+            rownrs = numpy.arange (nrow)
+        # A group starts where a value differs from the one in the previous row.
+        starts = numpy.zeros (nrow, bool)
+        starts[:1] = True
+        for col in cols:
+            val = col[rownrs]
+            starts[1:] |= val[1:] != val[:-1]
+        if sort  and  order.lower()[:1] == 'd':
+            # Reverse the order of the groups (keeping the rows in a group).
+            groupnrs = numpy.cumsum (starts)
+            rownrs = rownrs[numpy.argsort (-groupnrs, kind='mergesort')]
+            starts[:] = False
+            starts[:1] = True
+            starts[1:] = numpy.diff (groupnrs[::-1]) != 0
+        first = numpy.flatnonzero (starts)
+        offsets = numpy.append (first, nrow)
+        keys = {}
+        for i in range(len(cols)):
+            keys[columnnames[i]] = cols[i][rownrs[first]]
+        return (keys, offsets, rownrs)
+
+    def parallel_iter (self, columnnames, func, nworkers=None,
+                       order='', sort=True):
+        """Apply a function in parallel to the groups of a table iteration.
+
+        The table is divided into groups of rows as done by :func:`groupby`.
+        The groups are distributed over `nworkers` processes (default is
+        the number of CPUs). Each worker process opens the table readonly
+        and calls `func` with a reference table containing the rows of a
+        group. A list containing the results of `func` is returned in the
+        order of the iteration.
+
+        The worker processes open the table by name, so the table has to be
+        stored on disk. It can also be a reference table (e.g. the result
+        of :func:`query` or :func:`selectrows`) of such a table; then the
+        workers open the referenced table and select the rows of the groups
+        in it. The table is flushed first, so the workers see the data
+        changed in this process. An exception is raised for other tables
+        (e.g. a memory table or a concatenation of tables).
+        `func` and its result must be picklable, so `func` has to be defined
+        at the module level.
+
+        `order` and `sort` have the same meaning as in :func:`iter`.
+
+        For example, get the number of unflagged rows per baseline::
+
+          def nunflagged (t):
+            return (~t.getcol('FLAG_ROW')).sum()
+
+          t = table('3c343.MS')
+          res = t.parallel_iter(['ANTENNA1','ANTENNA2'], nunflagged)
+
+        """
+        import multiprocessing
+        import os
+        roots = self._rootnames()
+        if len(roots) != 1  or  \
+               not os.path.exists (os.path.join(roots[0], 'table.dat')):
+            raise RuntimeError ('parallel_iter can only be used for a table ' +
+                                'stored on disk or a reference table to it')
+        if roots[0] == self.name():
+            self.flush()
+        else:
+            table(roots[0], ack=False).flush()
+        keys, offsets, rownrs = self.groupby (columnnames, order, sort)
+        if roots[0] != self.name():
+            # Use the row numbers in the referenced table.
+            rownrs = numpy.asarray(self.rownumbers())[rownrs]
+        groups = [rownrs[offsets[i]:offsets[i+1]]
+                  for i in range(len(offsets) - 1)]
+        pool = multiprocessing.Pool (nworkers, _parallel_init, (roots[0],))
+        try:
+            result = pool.map (_parallel_call, [(func, rownrs)
+                                                for rownrs in groups])
+        finally:
+            pool.terminate()
+        return result
+
+    def iterchunks (self, columnnames, chunksize=10000, startrow=0, nrow=-1,
+                    slices={}, prefetch=False):
+        """Iterate through a table in chunks of consecutive rows.
+
+        It is a generator giving in each step a dict containing the data
+        of the given columns in the next chunk of rows. Similar to
+        :func:`tablerow.getrows` the data of a column is a numpy array where
+        the first axis is formed by the rows.
+        It makes it possible to process a large table with bounded memory
+        instead of getting entire columns with :func:`getcol`.
+
+        `columnnames`
+          The name of a column or a sequence of column names.
+        `chunksize`
+          The maximum number of rows in a chunk. If columns are stored
+          with a tiled storage manager, it is rounded up to a multiple of
+          the number of rows in a tile and chunks start at tile boundaries,
+          so each tile is read only once.
+        `startrow`, `nrow`
+          The part of the table to iterate through (default all rows).
+        `slices`
+          A dict giving for columns holding arrays the slice to get in
+          each cell as a sequence of blc, trc, and optionally inc
+          (as in :func:`getcolslice`).
+        `prefetch=True`
+          read the next chunk in a background thread while the current
+          chunk is being processed. In this way I/O and computation overlap.
+          Note that the table must not be accessed in the loop while
+          prefetching, because a casacore table cannot be used by multiple
+          threads at the same time. When leaving the loop early (by break
+          or an exception), the pending read is finished when the generator
+          is closed. That is done immediately in a `for` loop, but a
+          generator kept in a variable has to be closed explicitly (using
+          its method `close`) before the table can be used again.
+
+        For example, sum the DATA of the first channel of a MeasurementSet::
+
+          t = table('3c343.MS')
+          total = 0
+          for chunk in t.iterchunks(['DATA','FLAG'],
+                                    slices={'DATA': ([0,0], [0,3])}):
+            total += chunk['DATA'].sum()
+
+        """
+        if isinstance(columnnames, str):
+            columnnames = [columnnames];
+        chunksize = self._alignchunksize (columnnames, chunksize);
+        endrow = self.nrows();
+        if nrow >= 0:
+            endrow = min(endrow, startrow + nrow);
+        # Let a chunk end at a multiple of the chunk size.
+        chunks = [];
+        rownr = startrow;
+        while rownr < endrow:
+            n = min(chunksize - rownr % chunksize, endrow - rownr);
+            chunks.append ((rownr, n));
+            rownr += n;
+        if not prefetch:
+            for (rownr, n) in chunks:
+                yield self._getchunk (columnnames, rownr, n, slices);
+            return;
+        # Start reading the next chunk before handing out the current one.
+        # The C++ getcol functions release the GIL, so reading is done
+        # while the caller processes the current chunk.
+        reader = None;
+        try:
+            if len(chunks) > 0:
+                reader = _readahead (self._getchunk, columnnames,
+                                     chunks[0][0], chunks[0][1], slices);
+            for inx in range(len(chunks)):
+                chunk = reader.get();
+                reader = None;
+                if inx+1 < len(chunks):
+                    reader = _readahead (self._getchunk, columnnames,
+                                         chunks[inx+1][0], chunks[inx+1][1],
+                                         slices);
+                yield chunk;
+        finally:
+            # Do not let the reader use the table after the caller stopped
+            # iterating (e.g. by a break or an exception).
+            if reader is not None:
+                reader.wait();
+
+    def _getchunk (self, columnnames, startrow, nrow, slices):
+        """Get the data of the given columns in a chunk of rows."""
+        names = [nm for nm in columnnames if not slices.has_key(nm)];
+        result = self._getcols (names, startrow, nrow, 1);
+        for (name, slc) in slices.items():
+            if name in columnnames:
+                inc = [];
+                if len(slc) > 2:
+                    inc = slc[2];
+                result[name] = self._getcolslice (name, slc[0], slc[1], inc,
+                                                  startrow, nrow, 1);
+        return result;
+
+    def _tilerows (self, columnnames):
+        """Get the number of rows in a tile for columns in tiled storage.
+
+        It is the least common multiple of the tile lengths along the row
+        axis of the given columns. 1 is returned if none is tiled.
+
+        """
+        tilerows = 1;
+        for dm in self.getdminfo().itervalues():
+            if not dm['TYPE'] in ('TiledColumnStMan', 'TiledShapeStMan',
+                                  'TiledDataStMan'):
+                continue;
+            if not [nm for nm in dm['COLUMNS'] if nm in columnnames]:
+                continue;
+            spec = dm['SPEC'];
+            tileshapes = [cube['TileShape']
+                          for cube in spec.get('HYPERCUBES', {}).itervalues()
+                          if cube.has_key('TileShape')];
+            if len(tileshapes) == 0:
+                tileshapes = [spec.get('DEFAULTTILESHAPE', [])];
+            for tileshape in tileshapes:
+                if len(tileshape) > 0:
+                    # The row axis is the last (casacore ordered) axis.
+                    n = int(tileshape[-1]);
+                    (a, b) = (tilerows, n);
+                    while b > 0:
+                        (a, b) = (b, a % b);
+                    tilerows = tilerows * n / a;
+        return tilerows;
+
+    def _alignchunksize (self, columnnames, chunksize):
+        """Round the chunk size up to a multiple of the rows in a tile."""
+        tilerows = self._tilerows (columnnames);
+        return max(1, (chunksize + tilerows - 1) / tilerows) * tilerows;
+
+    def index (self, columnnames, sort=True, hashed=False, persistent=False,
+               directory=None):
         """Return a tableindex object.
 
         :class:`tableindex` lets one get the row numbers of the rows holding
@@ -413,6 +839,16 @@ class table(Table):
         By default the table is sorted on the given columns to get the correct
         index order.
 
+        If `hashed=True`, a :class:`tablehashindex` is returned instead.
+        It does not need to be sorted, so it is built much faster, but it
+        can only be used to look up equal keys (not key ranges).
+
+        If `persistent=True`, a :class:`tablefileindex` is returned instead.
+        It is stored in the table directory (or in `directory` if given),
+        so the next time the index is made for the same columns the stored
+        index can be used (if the table has not changed). If it cannot be
+        stored (e.g. for a readonly table directory), it is kept in memory.
+
         For example::
 
           t = table('3c343.MS')
@@ -420,6 +856,12 @@ class table(Table):
           print tinx.rownrs(0)           # print rownrs containing ANTENNA1=0
 
         """
+        if persistent:
+            from tablefileindex import tablefileindex;
+            return tablefileindex (self, columnnames, directory);
+        if hashed:
+            from tablehashindex import tablehashindex;
+            return tablehashindex (self, columnnames);
         from tableindex import tableindex;
         return tableindex (self, columnnames, sort);
 
@@ -508,6 +950,8 @@ class table(Table):
 
         """
         self._rename (newtablename);
+        self._roots = None;
+        self._procseen = self._procversion();
     
     def copy (self, newtablename, deep=False, valuecopy=False, dminfo={},
               endian='aipsrc', memorytable=False, copynorows=False):
@@ -633,7 +1077,59 @@ class table(Table):
 
     def datachanged (self):
         """Tell if data in the table have changed since the last time called."""
-        return self._datachanged()
+        self._syncdataversion()
+        changed = self._extversion != self._extseen
+        self._extseen = self._extversion
+        return changed
+
+    def _rootnames (self):
+        # The names of the tables holding the data of this table, i.e. its
+        # own name for a plain table and the referenced tables' names for a
+        # reference table.
+        if self._roots is None:
+            self._roots = list(self._partnames (True))
+        return self._roots
+
+    def _procversion (self):
+        # The number of changes made in this process to the root tables.
+        return sum([_procversions.get(name, 0) for name in self._rootnames()])
+
+    def _syncprocversion (self):
+        # Check if the data have been changed via another table object in
+        # this process. If so, the data version is updated and the indexes
+        # are told, so they are rebuilt when used next.
+        procversion = self._procversion()
+        if procversion != self._procseen:
+            self._procseen = procversion
+            self._dataversion += 1
+            self._notifyindexes ('setchanged')
+
+    def _datachange (self):
+        # Count a change of the data made via this table object.
+        # If the process-wide version was up to date, it is kept up to date,
+        # so the change is not seen as made via another table object.
+        insync = self._procseen == self._procversion()
+        _bumpprocversions (self._rootnames())
+        if insync:
+            self._procseen = self._procversion()
+        self._dataversion += 1
+
+    def _syncdataversion (self, interval=0):
+        # Check if the data have been changed via another table object in
+        # this process or by another process and update the data versions
+        # accordingly. The changed flag of the C++ table is reset when asked,
+        # so this is the only place asking for it; the query cache, indexes
+        # and tablecache compare the versions instead.
+        # The check for other processes is skipped if done less than
+        # `interval` seconds ago.
+        self._syncprocversion()
+        now = time.time()
+        if interval <= 0  or  now - self._extpolltime >= interval:
+            self._extpolltime = now
+            if self._datachanged():
+                self._extversion  += 1
+                self._dataversion += 1
+        return self._dataversion
 
     def ismultiused (self, checksubtables=False):
         """Tell if the table is used in other processes.
@@ -747,6 +1243,8 @@ class table(Table):
     def addrows (self, nrows=1):
         """Add one or more rows to the table."""
         self._addrows (nrows)
+        self._datachange()
+        self._notifyindexes ('_rowsadded')
 
     def removerows (self, rownrs):
         """Remove the given rows from the table.
@@ -775,6 +1273,8 @@ class table(Table):
 
         """
         self._removerows (rownrs)
+        self._datachange()
+        self._notifyindexes ('_rowsremoved', rownrs)
 
     def getcolshapestring (self, columnname,
                            startrow=0, nrow=-1, rowincr=1):
@@ -809,13 +1309,22 @@ class table(Table):
         """
         return self._iscelldefined (columnname, rownr)
 
-    def getcell (self, columnname, rownr):
+    def getcell (self, columnname, rownr, out=None):
         """Get data from a column cell.
 
         Get the contents of a cell which can be returned as a scalar value,
         a numpy array, or a dict depending on the contents of the cell.
 
+        If `out` is given, the array in the cell is read into it and `out`
+        is returned. It must be a contiguous numpy array with the data type
+        and shape of the cell (see :func:`getcol`).
+
         """
+        if out is not None:
+            _checkout (out)
+            self._getcolout (columnname, [], [], [], rownr, 1, 1,
+                             out.reshape((1,) + out.shape))
+            return out
         return self._getcell (columnname, rownr)
 
     def getcellslice (self, columnname, rownr, blc, trc, inc=[]):
@@ -832,7 +1341,8 @@ class table(Table):
         return self._getcellslice (columnname, rownr,
                                    blc, trc, inc);
 
-    def getcol (self, columnname, startrow=0, nrow=-1, rowincr=1):
+    def getcol (self, columnname, startrow=0, nrow=-1, rowincr=1, out=None,
+                stringarray=False):
         """Get the contents of a column or part of it.
 
         It is returned as a numpy array.
@@ -843,16 +1353,44 @@ class table(Table):
         The column can be sliced by giving a start row (default 0), number of
         rows (default all), and row stride (default 1).
 
+        Instead of a start row, a sequence (e.g. a numpy array) of row numbers
+        can be given. In that case the values of those rows are returned
+        in the order given and arguments `nrow` and `rowincr` are ignored.
+        The rows are read in a single call which is much faster than
+        getting the cells one by one. For example::
+
+          t.getcol ('TIME', numpy.array([10,3,7]))   # get rows 10, 3, and 7
+
+        If `out` is given, the data are read into that numpy array, which is
+        also returned. It avoids allocating a new array for each read when
+        getting a column in chunks. It must be a writable contiguous array
+        with the exact data type of the column and the shape of the result
+        (first axis is the row axis). For example::
+
+          buf = numpy.empty ((100,), 'float64')
+          for i in range(0, t.nrows(), 100):
+            t.getcol ('TIME', i, 100, out=buf)
+
+        A column containing strings is normally returned as a list (or as a
+        dict holding the shape and a flat list for arrays of strings).
+        If `stringarray=True`, it is returned as a fixed-width numpy string
+        array instead, which is much faster to create and handle for large
+        columns. Its width is the length of the longest string.
+
         """
-#        try:     # trial code to read using a vector of rownrs
-#            nr = len(startrow)
-#            if nrow < 0:
-#                nrow = nr
-#            if nrow == 0:
-#                return numpy.array()
-#            for inx in range(nrow):
-#                i = inx*
-#        except:
+        if out is not None:
+            return self._getcolinto (columnname, [], [], [],
+                                     startrow, nrow, rowincr, out)
+        if self._concatparts  and  not stringarray  and \
+               not _isrownrs(startrow):
+            return self._concatread (columnname, None, None, None,
+                                     startrow, nrow, rowincr)
+        if stringarray:
+            if _isrownrs(startrow):
+                return self._getcolstrrows (columnname, startrow)
+            return self._getcolstr (columnname, startrow, nrow, rowincr)
+        if _isrownrs(startrow):
+            return self._getcolrows (columnname, startrow)
         return self._getcol (columnname, startrow, nrow, rowincr)
 
     def getvarcol (self, columnname, startrow=0, nrow=-1, rowincr=1):
@@ -862,24 +1400,106 @@ class table(Table):
         numpy arrays.
         It can deal with a column containing variable shaped arrays.
 
+        As in :func:`getcol` a sequence of row numbers can be given instead
+        of a start row.
+
         """
+        if _isrownrs(startrow):
+            return self._getvarcolrows (columnname, startrow)
         return self._getvarcol (columnname, startrow, nrow, rowincr)
 
     def getcolslice (self, columnname, blc, trc, inc=[],
-                     startrow=0, nrow=-1, rowincr=1):
+                     startrow=0, nrow=-1, rowincr=1, out=None):
         """Get a slice from a table column holding arrays.
 
         The slice in each array is given by blc, trc, and inc (as in getcellslice).
         The column can be sliced by giving a start row (default 0), number of
         rows (default all), and row stride (default 1).
+        As in :func:`getcol` a sequence of row numbers can be given instead
+        of a start row.
 
         It returns a numpy array where the first axis is formed by the column
         cells. The other axes are the array axes.
+        As in :func:`getcol` the data can be read into a given `out` array.
 
         """
+        if out is not None:
+            return self._getcolinto (columnname, blc, trc, inc,
+                                     startrow, nrow, rowincr, out)
+        if self._concatparts  and  not _isrownrs(startrow):
+            return self._concatread (columnname, blc, trc, inc,
+                                     startrow, nrow, rowincr)
+        if _isrownrs(startrow):
+            return self._getcolslicerows (columnname, blc, trc, inc, startrow)
         return self._getcolslice (columnname, blc, trc, inc,
                                   startrow, nrow, rowincr);
 
+    def _getcolinto (self, columnname, blc, trc, inc,
+                     startrow, nrow, rowincr, out):
+        # Read (a slice of) a column into the given numpy array.
+        _checkout (out)
+        if _isrownrs(startrow):
+            self._getcolrowsout (columnname, blc, trc, inc, startrow, out)
+        else:
+            self._getcolout (columnname, blc, trc, inc,
+                             startrow, nrow, rowincr, out)
+        return out
+
+    def _concatread (self, columnname, blc, trc, inc,
+                     startrow, nrow, rowincr):
+        # Read the rows from the parts of a concatenated table in multiple
+        # threads. Each part is read directly into its section of the result.
+        # The parts were opened when the concatenation was opened.
+        # blc=None means reading entire cells (as getcol).
+        def read (t, startrow, nrow, out=None):
+            if out is not None:
+                return t._getcolinto (columnname, blc or [], trc or [],
+                                      inc or [], startrow, nrow, rowincr, out)
+            if blc is None:
+                return t._getcol (columnname, startrow, nrow, rowincr)
+            return t._getcolslice (columnname, blc, trc, inc,
+                                   startrow, nrow, rowincr)
+        if rowincr <= 0:
+            rowincr = 1
+        nrows = self.nrows()
+        if nrow < 0:
+            nrow = (nrows - startrow + rowincr - 1) / rowincr
+        # The parts are read in place, which is only possible if the result
+        # has the column's data type (e.g. a uChar column is returned as
+        # int16 and a string column as a list). Otherwise, or for rows
+        # outside the table, the normal read is done.
+        outtype = _coloutypes.get (self.coldatatype(columnname))
+        if outtype is None  or  startrow < 0  or  nrow <= 0  or  \
+               startrow + (nrow-1)*rowincr >= nrows:
+            return read (self, startrow, nrow)
+        # Determine the result rows k0:k1 and first row to read for each part.
+        reads = []
+        offset = 0
+        for part in self._concatparts:
+            n = part.nrows()
+            k0 = max(0, -((startrow - offset) / rowincr))
+            k1 = min(nrow, (offset + n - 1 - startrow) / rowincr + 1)
+            if k0 < k1:
+                reads.append ((part, k0, k1, startrow + k0*rowincr - offset))
+            offset += n
+        if len(reads) < 2:
+            return read (self, startrow, nrow)
+        # Get the shape of the (sliced) cells from the first row.
+        shape = ()
+        if not self.isscalarcol (columnname):
+            part, k0, k1, row = reads[0]
+            shape = read (part, row, 1).shape[1:]
+        result = numpy.empty ((nrow,) + shape, outtype)
+        def readparts (reads):
+            for (part, k0, k1, row) in reads:
+                read (part, row, k1-k0, result[k0:k1])
+        nthreads = min(self._concatthreads, len(reads))
+        threads = [_readahead (readparts, reads[i::nthreads])
+                   for i in range(nthreads)]
+        for thread in threads:
+            thread.get()
+        return result
+
     def putcell (self, columnname, rownr, value):
         """Put a value into one or more table cells.
 
@@ -901,6 +1521,7 @@ class table(Table):
 
         """
         self._putcell (columnname, rownr, value);
+        self._putdone ([columnname], rownr)
 
     def putcellslice (self, columnname, rownr, value, blc, trc, inc=[]):
         """Put into a slice of a table cell holding an array.
@@ -919,6 +1540,7 @@ class table(Table):
         """
         self._putcellslice (columnname, rownr, value,
                             blc, trc, inc);
+        self._putdone ([columnname], rownr)
 
     def putcol (self, columnname, value, startrow=0, nrow=-1, rowincr=1):
         """Put an entire column or part of it.
@@ -929,9 +1551,16 @@ class table(Table):
 
         The column can be sliced by giving a start row (default 0), number of
         rows (default all), and row stride (default 1).
+        As in :func:`getcol` a sequence of row numbers can be given instead
+        of a start row. The first axis of the value must match the number of
+        row numbers.
 
         """
-        self._putcol (columnname, startrow, nrow, rowincr, value);
+        if _isrownrs(startrow):
+            self._putcolrows (columnname, startrow, value);
+        else:
+            self._putcol (columnname, startrow, nrow, rowincr, value);
+        self._putdone ([columnname], startrow, nrow, rowincr)
 
     def putvarcol (self, columnname, value, startrow=0, nrow=-1, rowincr=1):
         """Put an entire column or part of it.
@@ -944,6 +1573,7 @@ class table(Table):
 
         """
         self._putvarcol (columnname, startrow, nrow, rowincr, value);
+        self._putdone ([columnname], startrow, nrow, rowincr)
 
     def putcolslice (self, columnname, value, blc, trc, inc=[],
                      startrow=0, nrow=-1, rowincr=1):
@@ -954,6 +1584,38 @@ class table(Table):
         """
         self._putcolslice (columnname, value, blc, trc, inc,
                            startrow, nrow, rowincr);
+        self._putdone ([columnname], startrow, nrow, rowincr)
+
+    def _putdone (self, columnnames, startrow, nrow=1, rowincr=1):
+        # Called after data have been put into the given rows. It updates
+        # the data versions (for the query caches of all table objects using
+        # the same data) and tells the indexes.
+        self._datachange()
+        if not self._indexes:
+            return
+        if _isrownrs(startrow):
+            rownrs = startrow
+        else:
+            if rowincr <= 0:
+                rowincr = 1
+            if nrow < 0:
+                nrow = (self.nrows() - startrow + rowincr - 1) / rowincr
+            rownrs = range(startrow, startrow + nrow*rowincr, rowincr)
+        self._notifyindexes ('_rowschanged', columnnames, rownrs)
+
+    def _addindex (self, index):
+        # Keep a weak reference to an index on this table. The class
+        # attribute is not modified, so each table gets its own list.
+        self._indexes = [ref for ref in self._indexes
+                         if ref() is not None] + [weakref.ref(index)]
+
+    def _notifyindexes (self, method, *args):
+        # Tell the indexes on this table that rows or values have changed
+        # by calling the given method in each index.
+        for ref in self._indexes:
+            index = ref()
+            if index is not None:
+                getattr(index, method) (*args)
 
     def addcols (self, desc, dminfo={}, addtoparent=True):
         """Add one or more columns.
@@ -1098,22 +1760,35 @@ class table(Table):
         else:
             return self._getkeyword (columnname, '', keyword);
 
-    def getkeywords (self):
+    def getkeywords (self, lazy=False):
         """Get the value of all table keywords.
 
         It is returned as a dict. See :func:`getkeyword` for the possible
         value types.
 
+        If `lazy=True` a :class:`tablekeywords` object is returned instead.
+        It behaves like a dict, but only reads a keyword when it is
+        accessed, which is much faster if the table has many or large
+        keywords (e.g. a MeasurementSet) and only a few are needed.
+
         """
+        if lazy:
+            from tablekeywords import tablekeywords;
+            return tablekeywords (self);
         return self._getkeywords ('');
 
-    def getcolkeywords (self, columnname):
+    def getcolkeywords (self, columnname, lazy=False):
         """Get the value of all keywords of a column.
 
         It is returned as a dict. See :func:`getkeyword` for the possible
         value types.
+        As in :func:`getkeywords` a lazy :class:`tablekeywords` object is
+        returned if `lazy=True`.
 
         """
+        if lazy:
+            from tablekeywords import tablekeywords;
+            return tablekeywords (self, columnname);
         return self._getkeywords (columnname);
 
     def putkeyword (self, keyword, value, makesubrecord=False):
@@ -1147,6 +1822,7 @@ class table(Table):
         val = value;
         if isinstance(val, table):
             val = _add_prefix (val.name());
+        self._kwversion += 1
         if isinstance(keyword, str):
             return self._putkeyword ('', keyword, -1, makesubrecord, val);
         else:
@@ -1161,6 +1837,7 @@ class table(Table):
         val = value;
         if isinstance(val, table):
             val = _add_prefix (val.name());
+        self._kwversion += 1
         if isinstance(keyword, str):
             return self._putkeyword (columnname, keyword, -1,
                                       makesubrecord, val);
@@ -1175,6 +1852,7 @@ class table(Table):
         It puts all keywords similar to :func:`putkeyword`.
 
         """
+        self._kwversion += 1
         return self._putkeywords ('', value);
 
     def putcolkeywords (self, columnname, value):
@@ -1184,6 +1862,7 @@ class table(Table):
         It puts all keywords similar to :func:`putkeyword`.
 
         """
+        self._kwversion += 1
         return self._putkeywords (columnname, value);
 
     def removekeyword (self, keyword):
@@ -1196,6 +1875,7 @@ class table(Table):
         the i-th keyword.
 
         """
+        self._kwversion += 1
         if isinstance(keyword, str):
             self._removekeyword ('', keyword, -1);
         else:
@@ -1207,6 +1887,7 @@ class table(Table):
         It is similar to :func:`removekeyword`.
 
         """
+        self._kwversion += 1
         if isinstance(keyword, str):
             self._removekeyword (columnname, keyword, -1);
         else:
@@ -1308,7 +1989,7 @@ class table(Table):
         return table(t, _oper=3);
 
     def query (self, query='', name='', sortlist='', columns='',
-               limit=0, offset=0, style='Python'):
+               limit=0, offset=0, style='Python', cache=False):
         """Query the table and return the result as a reference table.
 
         This method queries the table. It forms a
@@ -1344,6 +2025,16 @@ class table(Table):
           If > 0, ignore the first N matches.
         `style`
           The TaQL syntax style to be used (defaults to Python).
+        `cache`
+          If True, the row numbers of the result are cached in this table
+          object. If the same query is done again and the table has not
+          changed, the result is made from the cached row numbers without
+          executing the query. The table has changed if data are put or rows
+          are added or removed in this process (using this or another table
+          object of the same table, a reference table made from it, or a
+          TaQL UPDATE, INSERT or DELETE command), or if :func:`datachanged`
+          tells that the data have been changed by another process.
+          A query with a `name` or `columns` is not cached.
 
         """
         if not query and not sortlist and not columns and limit<=0 and offset<=0:
@@ -1362,10 +2053,68 @@ class table(Table):
             command += ' offset %d' % offset
         if name:
             command += ' giving ' + name;
+        if cache  and  not name  and  not columns:
+            return self._cachedquery (command, style);
         return tablecommand(command, style, [self]);
 
+    def _cachedquery (self, command, style):
+        # Execute a query command on this table. If it was executed before
+        # and the table has not changed since then, the result is made from
+        # the row numbers kept in the cache.
+        self._syncdataversion();
+        if self._querycache is None:
+            self._querycache = {};
+            self._queryorder = [];
+        key = (style, command);
+        entry = self._querycache.get (key);
+        if entry is not None:
+            self._queryorder.remove (key);
+            if entry[0] == self._dataversion:
+                self._queryorder.append (key);
+                return self.selectrows (entry[1]);
+            del self._querycache[key];
+        t = tablecommand(command, style, [self]);
+        self._querycache[key] = (self._dataversion,
+                                 numpy.array (t.rownumbers(self), 'int32'));
+        self._queryorder.append (key);
+        if len(self._queryorder) > self._querycachesize:
+            del self._querycache[self._queryorder.pop(0)];
+        return t;
+
+    def querycursor (self, query='', sortlist='', columns=[], pagesize=1000,
+                     style='Python'):
+        """Query the table and return a cursor to page through the result.
+
+        The query is done once as in :func:`query`, but only the row numbers
+        of the result are kept in a :class:`tablecursor` object. It gives the
+        data of the given columns in pages of `pagesize` rows on demand.
+        It is much faster than doing a query with `limit` and `offset` for
+        each page, because the WHERE part is not evaluated again.
+
+        `query`
+          The WHERE part of a TaQL command. If it is empty and no `sortlist`
+          is given, all rows are used.
+        `sortlist`
+          The ORDERBY part of a TaQL command.
+        `columns`
+          A column name or a sequence of column names to get in the pages
+          (default all columns).
+        `pagesize`
+          The number of rows in a page.
+        `style`
+          The TaQL syntax style to be used (defaults to Python).
+
+        """
+        from tablecursor import tablecursor;
+        if query  or  sortlist:
+            t = self.query (query, sortlist=sortlist, style=style);
+            rownrs = t.rownumbers(self);
+        else:
+            rownrs = numpy.arange (self.nrows());
+        return tablecursor (self, rownrs, columns, pagesize);
+
     def sort (self, sortlist, name='',
-              limit=0, offset=0, style='Python'):
+              limit=0, offset=0, style='Python', cache=False):
         """Sort the table and return the result as a reference table.
 
         This method sorts the table. It forms a
@@ -1391,6 +2140,8 @@ class table(Table):
           If > 0, ignore the first `offset` matches after the sort step.
         `style`
           The TaQL syntax style to be used (defaults to Python).
+        `cache`
+          If True, the result is cached as explained in :func:`query`.
 
         """
         command = 'select from $1 orderby ' + sortlist;
@@ -1400,6 +2151,8 @@ class table(Table):
             command += ' offset %d' % offset
         if name:
             command += ' giving ' + name;
+        if cache  and  not name:
+            return self._cachedquery (command, style);
         return tablecommand(command, style, [self]);
 
     def select (self, columns, name='', style='Python'):
@@ -0,0 +1,223 @@
+# tablecache.py: Python cache of open tables
+# Copyright (C) 2010
+# Associated Universities, Inc. Washington DC, USA.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Library General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+# License for more details.
+#
+# You should have received a copy of the GNU Library General Public License
+# along with this library; if not, write to the Free Software Foundation,
+# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+#
+# Correspondence concerning AIPS++ should be addressed as follows:
+#        Internet email: aips2-request@nrao.edu.
+#        Postal address: AIPS++ Project Office
+#                        National Radio Astronomy Observatory
+#                        520 Edgemont Road
+#                        Charlottesville, VA 22903-2475 USA
+#
+# $Id$
+
+import os
+import threading
+import time
+from table import table
+
+# Minimum time (in seconds) between updates of the memory estimate of a
+# cached table. Getting it requires calls into casacore.
+_memoryinterval = 1.
+
+
+def _cachememory (t):
+    """Estimate the memory (in bytes) used by the column caches of a table.
+
+    It uses the cache and bucket sizes of the storage managers as
+    given by :func:`table.getdminfo`. For tiled storage managers (e.g.
+    holding the DATA column of a MeasurementSet) the size of the tile
+    caches at this moment is used, which grows when data are accessed.
+
+    """
+    nbytes = 0
+    for dm in t.getdminfo().values():
+        spec = dm.get('SPEC', {})
+        nbytes += spec.get('CACHESIZE', 0) * spec.get('BUCKETSIZE', 0)
+    nbytes += t._tilecachememory()
+    return int(nbytes)
+
+
+class tablecache:
+    """A cache of open tables.
+
+    Opening a table (in particular a MeasurementSet with its many subtables)
+    takes time. A `tablecache` keeps tables open, so a program (e.g. a
+    service handling requests) reopening the same tables over and over
+    again can use the open table objects instead.
+
+    A table is cached for its name and the `readonly` and `lockoptions`
+    arguments it was opened with, so a readonly and a writable table are
+    different entries. If the data of a cached table have changed (see
+    :func:`table.datachanged`), it is resynced (see :func:`table.resync`)
+    before it is returned.
+
+    The least recently used tables are removed from the cache if it
+    contains more than `maxtables` tables or if the estimated memory used
+    by the cached tables exceeds `maxmemory` bytes (0 means no limit).
+    A removed table is closed when it is not used anymore. The memory is
+    estimated from the cache sizes of the storage managers, including the
+    tile caches filled by reading tiled data. The estimate of a table is
+    updated when it is obtained from the cache (at most once per second).
+
+    The tables returned are shared, so they should not be closed explicitly;
+    method :func:`close` should be used instead to remove a table from the
+    cache. A `tablecache` can be used by multiple threads, but a table
+    itself should not be used by multiple threads at the same time.
+
+    For example::
+
+      tc = tablecache(maxtables=10)
+      t = tc.open('3c343.ms')                 # opens the table
+      t = tc.open('3c343.ms')                 # uses the open table
+
+    Function :func:`defaulttablecache` returns the process-wide cache.
+
+    """
+
+    def __init__ (self, maxtables=16, maxmemory=0):
+        self._maxtables = maxtables
+        self._maxmemory = maxmemory
+        self._tables = {}   # key -> [table, extversion, memory, memorytime]
+        self._order  = []   # keys in least recently used order
+        self._lock   = threading.RLock()
+
+    def _key (self, tablename, readonly, lockoptions):
+        if isinstance(lockoptions, dict):
+            lockoptions = tuple(sorted(lockoptions.items()))
+        return (os.path.realpath(tablename), readonly, lockoptions)
+
+    def open (self, tablename, readonly=True, lockoptions='default'):
+        """Get the table from the cache or open and add it.
+
+        The arguments have the same meaning as in the :class:`table`
+        constructor.
+
+        """
+        key = self._key (tablename, readonly, lockoptions)
+        self._lock.acquire()
+        try:
+            entry = self._tables.get (key)
+            if entry is not None:
+                self._order.remove (key)
+                self._order.append (key)
+        finally:
+            self._lock.release()
+        # Do not hold the lock while calling casacore, so other threads
+        # can use the cache meanwhile.
+        if entry is None:
+            t = table (tablename, readonly=readonly, lockoptions=lockoptions,
+                       ack=False)
+            entry = [t, t._extversion, 0, 0.]
+        else:
+            t = entry[0]
+            # Compare the versions instead of using datachanged, which
+            # would hide the change from the user of the table.
+            t._syncdataversion()
+            if t._extversion != entry[1]:
+                t.resync()
+                entry[1] = t._extversion
+        now = time.time()
+        if self._maxmemory > 0  and  now - entry[3] >= _memoryinterval:
+            entry[2] = _cachememory (t)
+            entry[3] = now
+        self._lock.acquire()
+        try:
+            cached = self._tables.get (key)
+            if cached is None:
+                self._tables[key] = entry
+                self._order.append (key)
+            elif cached is not entry:
+                # Another thread opened the table meanwhile; use that one.
+                entry = cached
+            self._evict (key)
+            return entry[0]
+        finally:
+            self._lock.release()
+
+    def _evict (self, keep):
+        # Remove the least recently used tables until the limits are met.
+        # The table with the given key is always kept. The memory estimates
+        # of the tables are used as last updated by open.
+        memory = 0
+        if self._maxmemory > 0:
+            memory = sum([entry[2] for entry in self._tables.values()])
+        inx = 0
+        while inx < len(self._order)  and  \
+              (len(self._order) > self._maxtables  or
+               (self._maxmemory > 0  and  memory > self._maxmemory)):
+            key = self._order[inx]
+            if key == keep:
+                inx += 1
+                continue
+            del self._order[inx]
+            memory -= self._tables.pop(key)[2]
+
+    def close (self, tablename):
+        """Remove the table with the given name from the cache.
+
+        All entries for the table (opened readonly or writable) are removed.
+        The table is closed when it is not used anymore.
+
+        """
+        name = os.path.realpath(tablename)
+        self._lock.acquire()
+        try:
+            for key in [k for k in self._order if k[0] == name]:
+                self._order.remove (key)
+                del self._tables[key]
+        finally:
+            self._lock.release()
+
+    def clear (self):
+        """Remove all tables from the cache."""
+        self._lock.acquire()
+        try:
+            self._tables = {}
+            self._order  = []
+        finally:
+            self._lock.release()
+
+    def memory (self):
+        """Get the estimated memory (in bytes) used by the cached tables.
+
+        The memory used by each table is determined anew.
+
+        """
+        self._lock.acquire()
+        try:
+            tables = [entry[0] for entry in self._tables.values()]
+        finally:
+            self._lock.release()
+        return sum([_cachememory(t) for t in tables])
+
+    def __len__ (self):
+        return len(self._order)
+
+    def __contains__ (self, tablename):
+        name = os.path.realpath(tablename)
+        for key in self._order:
+            if key[0] == name:
+                return True
+        return False
+
+
+_defaultcache = tablecache()
+
+def defaulttablecache ():
+    """Get the process-wide :class:`tablecache` object."""
+    return _defaultcache
@@ -25,6 +25,22 @@
 #
 # $Id: tablecolumn.py,v 1.9 2007/08/28 07:22:18 gvandiep Exp $
 
+import numpy
+
+def _isindexarray (key):
+    """Tell if an index is given as a sequence of row numbers or a mask."""
+    return isinstance(key, list) or isinstance(key, tuple) or \
+           isinstance(key, numpy.ndarray)
+
+def _forwardslice (sei):
+    """Turn a checkkey slice into the same rows with a positive stride."""
+    # casacore needs a positive row stride. Also used by tablerow.
+    if len(sei) == 1  or  sei[2] > 0:
+        return sei;
+    if sei[1] == 0:
+        return [0, 0, 1];
+    return [sei[0] + (sei[1]-1)*sei[2], sei[1], -sei[2]];
+
 class tablecolumn:
     """The Python interface to a column in a Casacore table.
 
@@ -48,9 +64,18 @@ class tablecolumn:
 
       tc[0]               # get cell 0
       tc[:5]              # get cell 0,1,2,3,4
-      tc[-5,-1,]          # get last 4 cells
-      tc[-1,-5,-1]        # get last 4 cells in reversed order
-      tc[1] = tr[0]       # put value of cell 0 into cell 1
+      tc[-5:-1]           # get last 4 cells
+      tc[-1:-5:-1]        # get last 4 cells in reversed order
+      tc[1] = tc[0]       # put value of cell 0 into cell 1
+
+    A slice is read or written in a single call and returned as a numpy array
+    (unless the column contains variable shaped arrays; then a list is
+    returned).
+    Similar to numpy it is possible to index with a sequence of row numbers
+    or with a boolean mask having the length of the column. For example::
+
+      tc[[0,4,2]]         # get cells 0,4,2
+      tc[tc[:] > 10]      # get cells with a value > 10
 
     """
 
@@ -209,43 +234,92 @@ class tablecolumn:
         return self._table.nrows();
 
     def __getitem__ (self, key):
-        sei = self.checkkey (key, self._table.nrows());
+        nrows = self._table.nrows();
+        if _isindexarray(key):
+            # Numpy style indexing using row numbers or a boolean mask.
+            rownrs = self._indexrows (key, nrows);
+            if self.isvar():
+                return [self.getcell(rownr) for rownr in rownrs];
+            return self._table.getcol (self._column, rownrs);
+        sei = self.checkkey (key, nrows);
         if len(sei) == 1:
             # A single row.
             return self.getcell (sei[0]);
-        # Handle row by row and store values in a list.
-        result = [];
-        rownr  = sei[0];
-        inx    = 0;
-        while inx < sei[1]:
-            result.append (self.getcell (rownr));
-            rownr += sei[2];
-            inx   += 1;
+        if self.isvar():
+            # Arrays can differ in shape, so handle row by row and store
+            # values in a list.
+            result = [];
+            rownr  = sei[0];
+            inx    = 0;
+            while inx < sei[1]:
+                result.append (self.getcell (rownr));
+                rownr += sei[2];
+                inx   += 1;
+            return result;
+        # Get all rows in a single call; reverse for a negative stride.
+        fsei = _forwardslice (sei);
+        result = self.getcol (fsei[0], fsei[1], fsei[2]);
+        if sei[2] < 0:
+            return result[::-1];
         return result;
 
     def __setitem__ (self, key, value):
-        sei = self.checkkey (key, self._table.nrows());
-        if len(sei) == 1:
-            # A single row.
-            return self.putcell (sei[0], value);
-        # Handle row by row.
-        rownr = sei[0];
-        inx   = 0;
-        if not (isinstance(value,list) or isinstance(value,tuple)):
+        nrows = self._table.nrows();
+        if _isindexarray(key):
+            rownrs = self._indexrows (key, nrows);
+        else:
+            sei = self.checkkey (key, nrows);
+            if len(sei) == 1:
+                # A single row.
+                return self.putcell (sei[0], value);
+            rownrs = numpy.arange (sei[0], sei[0] + sei[1]*sei[2], sei[2]);
+        if not self._isrowvalues (value):
             # The same value is put in all rows.
-            while inx < sei[1]:
-                self.putcell (rownr, value);
-                rownr += sei[2];
-                inx   += 1;
+            self._table.putcell (self._column, rownrs, value);
+            return True;
+        # Each row has its own value.
+        if len(value) != len(rownrs):
+            raise RuntimeError("tablecolumn slice length differs from value length")
+        if self.isvar():
+            for inx in range(len(rownrs)):
+                self.putcell (rownrs[inx], value[inx]);
+        elif _isindexarray(key):
+            self._table.putcol (self._column, value, rownrs);
         else:
-            # Each row has its own value.
-            if len(value) != sei[1]:
-                raise RuntimeError("tablecolumn slice length differs from value length")
-            for val in value:
-                self.putcell (rownr, val);
-                rownr += sei[2];
+            fsei = _forwardslice (sei);
+            if sei[2] < 0:
+                value = value[::-1];
+            self.putcol (value, fsei[0], fsei[1], fsei[2]);
         return True;
-        
+
+    def _isrowvalues (self, value):
+        # A list or tuple holds a value per row. A numpy array does so if it
+        # has one axis more than the cells in the column.
+        if isinstance(value, list) or isinstance(value, tuple):
+            return True;
+        if not isinstance(value, numpy.ndarray) or value.ndim == 0:
+            return False;
+        if self.isscalar():
+            return True;
+        ndim = self.getdesc().get('ndim', 0);
+        return ndim > 0  and  value.ndim == ndim+1;
+
+    def _indexrows (self, key, nrows):
+        # Turn a boolean mask or a sequence of row numbers (possibly negative,
+        # thus from the end) into a numpy array of row numbers.
+        rownrs = numpy.asarray(key);
+        if rownrs.ndim != 1:
+            raise IndexError("tablecolumn index array must be 1-dimensional");
+        if rownrs.dtype == bool:
+            if len(rownrs) != nrows:
+                raise IndexError("tablecolumn boolean index length differs from number of rows");
+            return rownrs.nonzero()[0];
+        rownrs = rownrs.astype(int);
+        rownrs = numpy.where (rownrs < 0, rownrs + nrows, rownrs);
+        if len(rownrs) > 0  and  (rownrs.min() < 0  or  rownrs.max() >= nrows):
+            raise IndexError("tablecolumn index out of range");
+        return rownrs;
+
     def checkkey (self, key, nrows):
         if not isinstance(key, slice):
             # A single index (possibly negative, thus from the end).
@@ -260,7 +334,7 @@ class tablecolumn:
         if key.step != None:
             incr = key.step;
             if incr == 0:
-                raise RunTimeError("tablecolumn slice step cannot be zero");
+                raise RuntimeError("tablecolumn slice step cannot be zero");
         strow  = 0;
         endrow = nrows;
         if incr < 0:
@@ -0,0 +1,106 @@
+# tablecursor.py: Python cursor to page through a table selection
+# Copyright (C) 2010
+# Associated Universities, Inc. Washington DC, USA.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Library General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+# License for more details.
+#
+# You should have received a copy of the GNU Library General Public License
+# along with this library; if not, write to the Free Software Foundation,
+# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+#
+# Correspondence concerning AIPS++ should be addressed as follows:
+#        Internet email: aips2-request@nrao.edu.
+#        Postal address: AIPS++ Project Office
+#                        National Radio Astronomy Observatory
+#                        520 Edgemont Road
+#                        Charlottesville, VA 22903-2475 USA
+#
+# $Id$
+
+import numpy
+
+
+class tablecursor:
+    """A cursor to page through the rows selected in a table.
+
+    A `tablecursor` holds the row numbers of a selection (e.g. the result
+    of a query) and gives the data of the selected rows page by page.
+    Unlike querying with `limit` and `offset` for each page, the selection
+    is only done once. A page is a dict containing for each column a numpy
+    array (or list) with the data of the rows in the page, read in a single
+    call per column.
+
+    It can be constructed using the :func:`table.querycursor` method::
+
+      t = table('3c343.MS')
+      cur = t.querycursor('ANTENNA1 == 1', columns=['TIME','DATA'],
+                          pagesize=100)
+      print len(cur), cur.npages()
+      page = cur.page(3)               # rows 300-399 of the selection
+      for page in cur:                 # iterate through all pages
+        print page['TIME']
+
+    The columns must hold scalars or arrays with a fixed shape.
+
+    """
+
+    def __init__ (self, table, rownrs, columnnames=[], pagesize=1000):
+        if isinstance(columnnames, str):
+            columnnames = [columnnames]
+        if len(columnnames) == 0:
+            columnnames = table.colnames()
+        if pagesize <= 0:
+            raise ValueError ('pagesize must be positive')
+        self._table       = table
+        self._rownrs      = numpy.asarray (rownrs, 'int32')
+        self._columnnames = list(columnnames)
+        self._pagesize    = pagesize
+
+    def __len__ (self):
+        """Get the number of selected rows."""
+        return len(self._rownrs)
+
+    def npages (self):
+        """Get the number of pages."""
+        return (len(self._rownrs) + self._pagesize - 1) / self._pagesize
+
+    def rownumbers (self):
+        """Get the row numbers of the selected rows."""
+        return self._rownrs
+
+    def colnames (self):
+        """Get the names of the columns in a page."""
+        return list(self._columnnames)
+
+    def page (self, pagenr):
+        """Get the data of the given page (0-relative).
+
+        A negative page number counts from the end.
+
+        """
+        npages = self.npages()
+        if pagenr < 0:
+            pagenr += npages
+        if pagenr < 0  or  pagenr >= npages:
+            raise IndexError ('tablecursor page number out of range')
+        return self.rows (pagenr * self._pagesize, self._pagesize)
+
+    def rows (self, start, nrow):
+        """Get the data of `nrow` selected rows starting at `start`."""
+        rownrs = self._rownrs[start:start+nrow]
+        result = {}
+        for name in self._columnnames:
+            result[name] = self._table.getcol (name, rownrs)
+        return result
+
+    def __iter__ (self):
+        for pagenr in range(self.npages()):
+            yield self.page (pagenr)
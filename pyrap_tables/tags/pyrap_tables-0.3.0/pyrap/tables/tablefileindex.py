@@ -0,0 +1,329 @@
+# tablefileindex.py: Python table index stored with the table
+# Copyright (C) 2010
+# Associated Universities, Inc. Washington DC, USA.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Library General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+# License for more details.
+#
+# You should have received a copy of the GNU Library General Public License
+# along with this library; if not, write to the Free Software Foundation,
+# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+#
+# Correspondence concerning AIPS++ should be addressed as follows:
+#        Internet email: aips2-request@nrao.edu.
+#        Postal address: AIPS++ Project Office
+#                        National Radio Astronomy Observatory
+#                        520 Edgemont Road
+#                        Charlottesville, VA 22903-2475 USA
+#
+# $Id$
+
+import os
+import shutil
+import time
+import hashlib
+import numpy
+from tablehashindex import _indexbase
+
+# Minimum time (in seconds) between checks if another process changed the
+# table. A check reads the table's lock file.
+_pollinterval = 1.
+
+# The coarsest modification time resolution of the file systems used.
+# A stored index is only trusted if the table files were last modified at
+# least this long before the index was built; otherwise the table could
+# have changed afterwards without changing the modification time.
+_mtimeresolution = 2.
+
+
+class tablefileindex(_indexbase):
+    """A table index stored on disk.
+
+    A `tablefileindex` has the same interface as :class:`tableindex`.
+    It stores the index in a subdirectory of the table (named
+    pyrapindex.<columnnames>), so it only has to be built once. When the index is created again for the same columns
+    (e.g. in another process), the stored index is memory-mapped, so it is
+    ready to be used without reading and sorting the columns.
+
+    The index is stored as the sorted unique keys, and per key the row
+    numbers containing the key. A binary search is used to find keys or
+    key ranges. The index can only be made for columns containing scalars.
+
+    The stored index is rebuilt automatically (and stored again) if the
+    table has changed, i.e. if the number of rows, the modification time or
+    the size of the table files differ from the ones stored with the index.
+    The files in subdirectories of the table (e.g. of a storage manager)
+    are taken into account, but not the subtables.
+    Changes made in this process (via any table object or a TaQL command)
+    are detected as well. Changes made by another process while the index is
+    in use are detected like :func:`table.datachanged` does (at most once
+    per second). The index is not updated incrementally; after a change it
+    is rebuilt (and stored again) when it is used the next time.
+
+    It can be constructed using the :func:`table.index` method::
+
+      t = table('3c343.MS')
+      tinx = t.index ('ANTENNA1', persistent=True)
+      print tinx.rownrs(0)
+
+    Argument `directory` can be given to store the index in another
+    directory, for example if the table is readonly or if the table
+    directory should not be changed. The index gets a name derived from
+    the absolute table name in that directory.
+    If the index cannot be written (e.g. if the table directory is not
+    writable), it is only kept in memory.
+    A stored index can always be deleted; it is rebuilt when needed.
+
+    """
+
+    def __init__ (self, table, columnnames, directory=None):
+        _indexbase.__init__ (self, table, columnnames)
+        indexname = 'pyrapindex.' + '.'.join(self._columnnames)
+        if directory is None:
+            self._dirname = os.path.join (table.name(), indexname)
+        else:
+            # Make the name unique for the table.
+            tabname = os.path.abspath (table.name())
+            self._dirname = os.path.join (directory, '%s.%s.%s' %
+                                          (os.path.basename(tabname),
+                                           hashlib.md5(tabname).hexdigest()[:8],
+                                           indexname))
+        self._extversion  = table._extversion
+        if not self._load():
+            self._build()
+        table._addindex (self)
+
+    def _version (self):
+        # The modification state of the table: its number of rows and the
+        # latest modification time and total size of its files, including
+        # the files in subdirectories (lock file, stored indexes and
+        # subtables excluded).
+        mtime = 0
+        size  = 0
+        name = self._table.name()
+        for dirname, subdirs, fnames in os.walk (name):
+            if dirname != name  and  'table.dat' in fnames:
+                # A subtable.
+                subdirs[:] = []
+                continue
+            subdirs[:] = [d for d in subdirs
+                          if not (dirname == name  and
+                                  d.startswith('pyrapindex.'))]
+            for fname in fnames:
+                if dirname != name  or  fname != 'table.lock':
+                    st = os.stat (os.path.join(dirname, fname))
+                    mtime = max(mtime, st.st_mtime)
+                    size += st.st_size
+        return numpy.array ([self._table.nrows(), mtime, size], 'float64')
+
+    def _load (self):
+        # Memory-map the stored index if it is up to date. The version holds
+        # the table version and the time the index was built.
+        try:
+            version = numpy.load (os.path.join(self._dirname, 'version.npy'))
+        except (IOError, OSError, ValueError):
+            return False
+        if len(version) != 4  or  \
+               not (version[:3] == self._version()).all()  or  \
+               version[1] > version[3] - _mtimeresolution:
+            return False
+        self._keys = [numpy.load (os.path.join(self._dirname, 'keys%d.npy' % i),
+                                  mmap_mode='r')
+                      for i in range(len(self._columnnames))]
+        self._offsets = numpy.load (os.path.join(self._dirname, 'offsets.npy'),
+                                    mmap_mode='r')
+        self._rownrs  = numpy.load (os.path.join(self._dirname, 'rownrs.npy'),
+                                    mmap_mode='r')
+        self._nrow    = int(version[0])
+        return True
+
+    def _build (self):
+        # Make the index using groupby and store it. The version is
+        # determined before reading the columns, so a change made meanwhile
+        # makes the stored index out of date.
+        self._table._syncdataversion()
+        self._extversion = self._table._extversion
+        version = numpy.append (self._version(), time.time())
+        keys, offsets, rownrs = self._table.groupby (self._columnnames)
+        self._keys    = [numpy.asarray(keys[name])
+                         for name in self._columnnames]
+        self._offsets = offsets
+        self._rownrs  = rownrs
+        self._nrow    = len(rownrs)
+        self._changed = False
+        self._save (version)
+
+    def _save (self, version):
+        # Store the index. The version is written last, so an index that
+        # is partly written is never used. Nothing is written if the
+        # directory is not writable; a partly written index is removed.
+        fname = os.path.join (self._dirname, 'version.npy')
+        parent = os.path.dirname (self._dirname)
+        if not os.access (os.path.isdir(self._dirname) and self._dirname
+                          or parent, os.W_OK):
+            return
+        try:
+            if os.path.exists (fname):
+                os.remove (fname)
+            elif not os.path.isdir (self._dirname):
+                os.mkdir (self._dirname)
+            for i in range(len(self._keys)):
+                numpy.save (os.path.join(self._dirname, 'keys%d.npy' % i),
+                            self._keys[i])
+            numpy.save (os.path.join(self._dirname, 'offsets.npy'),
+                        self._offsets)
+            numpy.save (os.path.join(self._dirname, 'rownrs.npy'),
+                        self._rownrs)
+            numpy.save (fname, version)
+        except (IOError, OSError):
+            shutil.rmtree (self._dirname, True)
+
+    def _check (self):
+        # Rebuild the index if the table has changed.
+        if not self._changed  and  self._nrow == self._table.nrows():
+            self._table._syncdataversion (_pollinterval)
+            if self._table._extversion == self._extversion:
+                return
+        self._build()
+
+    def _rowschanged (self, columnnames, rownrs):
+        # Called by the table when values have changed.
+        if len([name for name in self._columnnames
+                if name in columnnames]) > 0:
+            self._changed = True
+
+    def _rowsadded (self):
+        self._changed = True
+
+    def _rowsremoved (self, rownrs):
+        self._changed = True
+
+    def _position (self, key, side):
+        # Find the position of the key in the sorted unique keys.
+        # The keys are sorted on the first column, then the second, etc.
+        # side='left' gives the first key >= key, 'right' the first key > key.
+        lo = 0
+        hi = len(self._keys[0])
+        for i in range(len(key)):
+            col = self._keys[i][lo:hi]
+            if i == len(key) - 1:
+                return lo + col.searchsorted (key[i], side)
+            start = lo + col.searchsorted (key[i], 'left')
+            end   = lo + col.searchsorted (key[i], 'right')
+            if start == end:
+                return start
+            lo = start
+            hi = end
+        return lo
+
+    def _getrownrs (self, start, end):
+        # Get the (ascending) row numbers of the keys start:end.
+        rownrs = numpy.array (self._rownrs[self._offsets[start]:
+                                           self._offsets[end]])
+        if end - start > 1:
+            rownrs.sort()
+        return rownrs
+
+    def rownr (self, key):
+        """Get the unique row number containing the key (-1 if not found).
+
+        The key has to be given in the same way as for
+        :func:`tableindex.rownr`. An exception is raised if the index is
+        not unique.
+
+        """
+        if not self.isunique():
+            raise RuntimeError ('tablefileindex is not unique; ' +
+                                'use method rownrs instead')
+        key = self._keyvalues (key)
+        start = self._position (key, 'left')
+        if start == self._position (key, 'right'):
+            return -1
+        return int(self._rownrs[self._offsets[start]])
+
+    def rownrs (self, key, upperkey={}, lowerincl=True, upperincl=True):
+        """Get a list of the row numbers containing the key(s).
+
+        The arguments are the same as for :func:`tableindex.rownrs`.
+
+        """
+        self._check()
+        lkey = self._keyvalues (key)
+        if upperkey == {}:
+            return self._getrownrs (self._position (lkey, 'left'),
+                                    self._position (lkey, 'right')).tolist()
+        ukey = self._keyvalues (upperkey)
+        start = self._position (lkey, lowerincl and 'left' or 'right')
+        end   = self._position (ukey, upperincl and 'right' or 'left')
+        if end <= start:
+            return []
+        return self._getrownrs (start, end).tolist()
+
+    def rownrs_many (self, keys, unique=False):
+        """Get the row numbers for many keys in a single call.
+
+        The keys and the result are the same as for
+        :func:`tableindex.rownrs_many`.
+
+        """
+        cols = self._keycolumns (keys)
+        if unique  and  not self.isunique():
+            raise RuntimeError ('tablefileindex is not unique')
+        self._check()
+        nkey = len(cols[0])
+        if len(cols) == 1:
+            # Do the binary search for all keys at once.
+            start = self._keys[0].searchsorted (cols[0], 'left')
+            end   = self._keys[0].searchsorted (cols[0], 'right')
+        else:
+            start = numpy.array ([self._position ([col[k] for col in cols],
+                                                  'left')
+                                  for k in range(nkey)], int)
+            end   = numpy.array ([self._position ([col[k] for col in cols],
+                                                  'right')
+                                  for k in range(nkey)], int)
+        found = end > start
+        if unique:
+            rownrs = -numpy.ones (nkey, 'int32')
+            rownrs[found] = self._rownrs[self._offsets[start[found]]]
+            return rownrs
+        offsets = numpy.zeros (nkey + 1, 'int32')
+        start = numpy.asarray(self._offsets)[start]
+        end   = numpy.asarray(self._offsets)[end]
+        offsets[1:] = numpy.cumsum (end - start)
+        rownrs = numpy.empty (offsets[-1], 'int32')
+        for k in numpy.flatnonzero(found):
+            rownrs[offsets[k]:offsets[k+1]] = self._rownrs[start[k]:end[k]]
+        return (rownrs, offsets)
+
+    def isunique (self):
+        """Tell if all keys in the index are unique."""
+        self._check()
+        return len(self._keys[0]) == self._nrow
+
+    def _getslice (self, key):
+        if key.step != None:
+            raise RuntimeError ('tablefileindex slicing cannot have a step')
+        if len(self._columnnames) != 1:
+            raise RuntimeError ('tablefileindex slicing can only be done ' +
+                                'for a single column index')
+        self._check()
+        start = 0
+        if key.start != None:
+            start = self._position ([key.start], 'left')
+        end = len(self._keys[0])
+        if key.stop != None:
+            end = self._position ([key.stop], 'left')
+        rnrs = []
+        if end > start:
+            rnrs = self._getrownrs (start, end).tolist()
+        if len(rnrs) == 0:
+            raise KeyError ('keys not found in tablefileindex')
+        return rnrs
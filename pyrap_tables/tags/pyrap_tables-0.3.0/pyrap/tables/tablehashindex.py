@@ -0,0 +1,311 @@
+# tablehashindex.py: Python hash index on table columns
+# Copyright (C) 2010
+# Associated Universities, Inc. Washington DC, USA.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Library General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+# License for more details.
+#
+# You should have received a copy of the GNU Library General Public License
+# along with this library; if not, write to the Free Software Foundation,
+# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+#
+# Correspondence concerning AIPS++ should be addressed as follows:
+#        Internet email: aips2-request@nrao.edu.
+#        Postal address: AIPS++ Project Office
+#                        National Radio Astronomy Observatory
+#                        520 Edgemont Road
+#                        Charlottesville, VA 22903-2475 USA
+#
+# $Id$
+
+import bisect
+import numpy
+
+
+class _indexbase:
+    """Functions shared by tablehashindex and tablefileindex.
+
+    A derived class has to implement rownr, isunique, and _getslice.
+
+    """
+
+    def __init__ (self, table, columnnames):
+        if isinstance(columnnames, str):
+            columnnames = [columnnames]
+        self._table       = table
+        self._columnnames = list(columnnames)
+        self._changed     = False
+
+    def _keyvalues (self, key):
+        # Turn a key (dict or single value) into a list of values.
+        if not isinstance(key, dict):
+            if len(self._columnnames) != 1:
+                raise RuntimeError ('key has to be given as a dict for a ' +
+                                    'multi-column index')
+            return [key]
+        return [key[name] for name in self._columnnames]
+
+    def _keycolumns (self, keys):
+        # Turn the keys given to rownrs_many (a dict of sequences or a
+        # sequence) into a 1-dim numpy array per column.
+        if not isinstance(keys, dict):
+            keys = {self._columnnames[0] : keys}
+        cols = [numpy.asarray(keys[name]).ravel()
+                for name in self._columnnames]
+        if len(set([len(col) for col in cols])) > 1:
+            raise ValueError ('all key arrays must have the same length')
+        return cols
+
+    def colnames (self):
+        """Return the column names the index is made of."""
+        return list(self._columnnames)
+
+    def setchanged (self, columnnames=[]):
+        """Tell the index that data has changed.
+
+        It only needs to be used if the table has been changed by another
+        process, because changes made in this process are detected.
+        The index is rebuilt when it is used the next time.
+        `columnnames` only exists for compatibility with
+        :func:`tableindex.setchanged`.
+
+        """
+        self._changed = True
+
+    def __getitem__ (self, key):
+        if isinstance(key, slice):
+            return self._getslice (key)
+        rnr = self.rownr (key)
+        if rnr < 0:
+            raise KeyError ('key not found in ' + self.__class__.__name__)
+        return rnr
+
+
+class tablehashindex(_indexbase):
+    """A hash index on one or more table columns.
+
+    A `tablehashindex` has the same interface as :class:`tableindex`, but
+    uses a Python dict mapping each key to its row numbers instead of a
+    sorted index. Building it does not require a sort, so it is much faster
+    for large tables, in particular for string keys. Lookups take constant
+    time. However, it can only be used to find equal keys; key ranges
+    can only be looked up using a :class:`tableindex`.
+
+    The index can only be built on columns containing scalars.
+    The index is updated incrementally when values are changed or rows are
+    added using the functions in :class:`table`, :class:`tablecolumn`, or
+    :class:`tablerow` of the table object the index was made for. After rows
+    are removed, the index is remade from the keys it holds. Changes made in
+    this process in another way (e.g. via a reference table made by
+    :func:`table.query`, another table object, or a TaQL UPDATE command)
+    make the index being rebuilt when it is used the next time. Changes
+    made by another process have to be told (see :func:`setchanged`).
+
+    It can be constructed using the :func:`table.index` method::
+
+      t = table('3c343.MS/FIELD')
+      tinx = t.index ('NAME', hashed=True)
+      rownr = tinx['3C343']          # find the row of a source
+
+    """
+
+    def __init__ (self, table, columnnames):
+        _indexbase.__init__ (self, table, columnnames)
+        self._build()
+        table._addindex (self)
+
+    def _build (self):
+        self._keys    = self._readkeys (0, -1)
+        self._changed = False
+        self._makeindex()
+
+    def _makeindex (self):
+        # Map each key to the (ascending) list of row numbers containing it.
+        keys  = self._keys
+        index = {}
+        for rownr in xrange(len(keys)):
+            rownrs = index.get (keys[rownr])
+            if rownrs is None:
+                index[keys[rownr]] = [rownr]
+            else:
+                rownrs.append (rownr)
+        self._index = index
+        self._nrow  = len(keys)
+
+    def _readkeys (self, startrow, nrow, columnnames=None, rownrs=None):
+        # Read the keys in the given rows.
+        # If column names are given, only those parts of the keys are read.
+        cols = []
+        for name in self._columnnames:
+            if columnnames is not None  and  name not in columnnames:
+                col = [key[len(cols)] for key in
+                       [self._keys[rownr] for rownr in rownrs]]
+            else:
+                if rownrs is not None:
+                    col = self._table.getcol (name, numpy.array(rownrs))
+                else:
+                    col = self._table.getcol (name, startrow, nrow)
+                if isinstance(col, numpy.ndarray):
+                    if col.ndim != 1:
+                        raise ValueError ('tablehashindex column ' + name +
+                                          ' must contain scalar values')
+                    col = col.tolist()
+            cols.append (col)
+        if len(cols) == 1:
+            return list(cols[0])
+        return zip(*cols)
+
+    def _rowschanged (self, columnnames, rownrs):
+        # Called by the table when values in the given rows have changed.
+        if self._changed  or  self._nrow != self._table.nrows():
+            self._changed = True
+            return
+        if len([name for name in self._columnnames
+                if name in columnnames]) == 0:
+            return
+        if not hasattr(rownrs, '__len__'):
+            rownrs = [rownrs]
+        rownrs = list(rownrs)
+        if len(rownrs) == 0:
+            return
+        keys = self._readkeys (0, -1, columnnames, rownrs)
+        for i in range(len(rownrs)):
+            rownr  = rownrs[i]
+            oldkey = self._keys[rownr]
+            if keys[i] != oldkey:
+                self._remove (oldkey, rownr)
+                self._insert (keys[i], rownr)
+                self._keys[rownr] = keys[i]
+
+    def _rowsadded (self):
+        # Called by the table when rows have been added.
+        nrow = self._table.nrows()
+        if self._changed  or  nrow < self._nrow:
+            self._changed = True
+            return
+        keys = self._readkeys (self._nrow, nrow - self._nrow)
+        for i in range(len(keys)):
+            self._insert (keys[i], self._nrow + i)
+        self._keys += keys
+        self._nrow  = nrow
+
+    def _rowsremoved (self, rownrs):
+        # Called by the table when rows have been removed.
+        # The rows after a removed row get renumbered, so the index is
+        # remade from the keys (without reading the table).
+        if self._changed:
+            return
+        if not hasattr(rownrs, '__len__'):
+            rownrs = [rownrs]
+        for rownr in sorted(set(rownrs), reverse=True):
+            del self._keys[rownr]
+        self._makeindex()
+        if self._nrow != self._table.nrows():
+            self._changed = True
+
+    def _insert (self, key, rownr):
+        rownrs = self._index.get (key)
+        if rownrs is None:
+            self._index[key] = [rownr]
+        else:
+            bisect.insort (rownrs, rownr)
+
+    def _remove (self, key, rownr):
+        rownrs = self._index[key]
+        rownrs.remove (rownr)
+        if len(rownrs) == 0:
+            del self._index[key]
+
+    def _check (self):
+        # Rebuild the index if the table has changed.
+        self._table._syncprocversion()
+        if self._changed  or  self._nrow != self._table.nrows():
+            self._build()
+
+    def _makekey (self, key):
+        # Turn a key (dict or single value) into a key in the index.
+        values = self._keyvalues (key)
+        if len(values) == 1:
+            return values[0]
+        return tuple(values)
+
+    def rownr (self, key):
+        """Get the unique row number containing the key (-1 if not found).
+
+        The key has to be given in the same way as for
+        :func:`tableindex.rownr`. An exception is raised if the index is
+        not unique.
+
+        """
+        if not self.isunique():
+            raise RuntimeError ('tablehashindex is not unique; ' +
+                                'use method rownrs instead')
+        rownrs = self._index.get (self._makekey(key))
+        if rownrs is None:
+            return -1
+        return rownrs[0]
+
+    def rownrs (self, key, upperkey={}, lowerincl=True, upperincl=True):
+        """Get a list of the row numbers containing the key.
+
+        A key range cannot be given, because a hash index is not sorted.
+        The arguments `upperkey`, `lowerincl`, and `upperincl` only exist
+        for compatibility with :func:`tableindex.rownrs`.
+
+        """
+        if upperkey != {}:
+            raise RuntimeError ('a tablehashindex cannot be used for key ' +
+                                'ranges; use a tableindex instead')
+        self._check()
+        return list(self._index.get (self._makekey(key), []))
+
+    def rownrs_many (self, keys, unique=False):
+        """Get the row numbers for many keys in a single call.
+
+        The keys and the result are the same as for
+        :func:`tableindex.rownrs_many`.
+
+        """
+        cols = [col.tolist() for col in self._keycolumns (keys)]
+        if len(cols) == 1:
+            keylist = cols[0]
+        else:
+            keylist = zip(*cols)
+        if unique:
+            if not self.isunique():
+                raise RuntimeError ('tablehashindex is not unique')
+            index = self._index
+            return numpy.array ([index.get(key, [-1])[0] for key in keylist],
+                                'int32')
+        self._check()
+        found = [self._index.get(key, []) for key in keylist]
+        offsets = numpy.zeros (len(found) + 1, 'int32')
+        offsets[1:] = numpy.cumsum ([len(rownrs) for rownrs in found])
+        rownrs = numpy.empty (offsets[-1], 'int32')
+        for i in range(len(found)):
+            rownrs[offsets[i]:offsets[i+1]] = found[i]
+        return (rownrs, offsets)
+
+    def isunique (self):
+        """Tell if all keys in the index are unique."""
+        self._check()
+        return len(self._index) == self._nrow
+
+    def __len__ (self):
+        """Get the number of different keys in the index."""
+        self._check()
+        return len(self._index)
+
+    def __contains__ (self, key):
+        self._check()
+        return self._makekey(key) in self._index
+
+    def _getslice (self, key):
+        raise RuntimeError ('a tablehashindex cannot be sliced')
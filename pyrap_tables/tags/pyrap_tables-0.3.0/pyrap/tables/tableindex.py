@@ -27,6 +27,7 @@
 
 # Make interface to class TableIndexProxy available.
 from _tables import TableIndex
+import numpy
 
 class tableindex(TableIndex):
     """ The Python interface to Casacore table index
@@ -60,6 +61,8 @@ class tableindex(TableIndex):
 
     def __init__(self, table, columnnames, sort=True):
         TableIndex.__init__ (self, table, columnnames, not sort);
+        self._table = table;
+        table._addindex (self);
     """Create the index on one or more columns.
 
     By default the columns get sorted when forming in the index. By giving
@@ -70,6 +73,11 @@ class tableindex(TableIndex):
     `tableindex` object.
 
     """
+    # Let the table tell if its data have been changed via another table
+    # object in this process (which calls setchanged).
+    def _check (self):
+        self._table._syncprocversion();
+
     # Turn a key into a dict if needed.
     def _makekey (self, key):
         d = key;
@@ -103,6 +111,7 @@ class tableindex(TableIndex):
         method :func:`rownrs` should be used instead.
 
         """
+        self._check();
         return self._rownr (self._makekey(key));
 
     def rownrs (self, key, upperkey={}, lowerincl=True, upperincl=True):
@@ -131,14 +140,55 @@ class tableindex(TableIndex):
           rownr = tinx[0:1]              # same as above
 
         """
+        self._check();
         lkey = self._makekey(key);
         ukey = self._makekey(upperkey);
         if len(ukey) == 0:
             return self._rownrs (lkey);
         return self._rownrsrange (lkey, ukey, lowerincl, upperincl);
 
+    def rownrs_many (self, keys, unique=False):
+        """Get the row numbers for many keys in a single call.
+
+        The keys are given as a dict where the name of each field should
+        correspond with a column name in the index and its value is a
+        numpy array (or sequence) containing the values of that key column.
+        All arrays must have the same length. If the index is made from a
+        single column, the array can also be given directly.
+
+        If `unique=True`, a numpy array is returned containing the row
+        number for each key (-1 if the key is not found). The index must
+        be unique.
+        Otherwise a tuple of numpy arrays `(rownrs, offsets)` is returned.
+        The row numbers for key i are `rownrs[offsets[i]:offsets[i+1]]`.
+
+        For example::
+
+          t = table('3c343.MS/ANTENNA')
+          tinx = t.index ('NAME')
+          rownrs = tinx.rownrs_many (['RTE','RT0','RT1'], unique=True)
+
+        """
+        d = self._makekey (keys);
+        rec = {};
+        for (name, values) in d.items():
+            values = numpy.asarray(values);
+            if values.dtype.kind in 'iu'  and  values.dtype.itemsize > 4:
+                # Table columns can hold 32-bit integers at most.
+                values = values.astype('int32');
+            rec[name] = values.ravel();
+        nkey = set([len(v) for v in rec.values()]);
+        if len(nkey) > 1:
+            raise ValueError("all key arrays must have the same length");
+        self._check();
+        res = self._rownrsmany (rec, unique);
+        if unique:
+            return res['rownrs'];
+        return (res['rownrs'], res['offsets']);
+
     def isunique (self):
         """Tell if all keys in the index are unique."""
+        self._check();
         return self._isunique()
 
     def colnames (self):
@@ -151,7 +201,14 @@ class tableindex(TableIndex):
         The index is smart enough to detect that the number of rows in the
         indexed table has changed. However, it cannot detect if a value in
         a column contained in this inex has changed. So it has to be told
-        explicitly.
+        explicitly. This is done automatically when the values are changed
+        in this process using the put functions in :class:`table`,
+        :class:`tablecolumn`, or :class:`tablerow` (also via another table
+        object, e.g. a reference table made by :func:`table.query`) or
+        using a TaQL UPDATE command. Changes made by another process have
+        to be told explicitly.
+        Note that the index is not updated incrementally; after a change
+        it is rebuilt when it is used the next time.
 
         `columnnames`
           The names of the columns in which data have changed.
@@ -159,6 +216,19 @@ class tableindex(TableIndex):
         """
         return self._setchanged (columnnames)
 
+    def _rowschanged (self, columnnames, rownrs):
+        # Called by the table when values in the given columns have changed.
+        changed = [name for name in self.colnames() if name in columnnames];
+        if len(changed) > 0:
+            self._setchanged (changed);
+
+    def _rowsadded (self):
+        # The index itself detects that the number of rows has changed.
+        pass
+
+    def _rowsremoved (self, rownrs):
+        pass
+
     def __getitem__ (self, key):
         if not isinstance(key, slice):
             rnr = self.rownr (key);
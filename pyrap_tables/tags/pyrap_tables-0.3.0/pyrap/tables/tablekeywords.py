@@ -0,0 +1,124 @@
+# tablekeywords.py: Python lazy access to table keywords
+# Copyright (C) 2010
+# Associated Universities, Inc. Washington DC, USA.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Library General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+# License for more details.
+#
+# You should have received a copy of the GNU Library General Public License
+# along with this library; if not, write to the Free Software Foundation,
+# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+#
+# Correspondence concerning AIPS++ should be addressed as follows:
+#        Internet email: aips2-request@nrao.edu.
+#        Postal address: AIPS++ Project Office
+#                        National Radio Astronomy Observatory
+#                        520 Edgemont Road
+#                        Charlottesville, VA 22903-2475 USA
+#
+# $Id$
+
+
+class tablekeywords:
+    """Lazy access to the keywords of a table or a table column.
+
+    The `tablekeywords` class behaves like a dict holding the keywords of a
+    table (or of a column if a column name is given). Unlike
+    :func:`table.getkeywords` it does not convert the entire keyword set
+    to Python at once. A keyword value is only read when it is accessed.
+    It is cached until a keyword of the table is changed using the
+    `tablekeywords` object or one of the `put` or `remove` keyword methods
+    in :class:`table`. Note that a value is returned as is, so modifying
+    a returned dict or array also modifies the cached value.
+
+    For example::
+
+      t = table('3C343.MS')
+      kw = tablekeywords(t)
+      # kw = t.getkeywords(lazy=True)   # another way to construct it
+      kw.keys()                         # names of the table keywords
+      kw['ANTENNA']                     # only this keyword is read
+      kw['MS_VERSION'] = 2.0            # same as t.putkeyword(...)
+
+    Similar to :func:`table.getkeyword` a keyword name can consist of
+    multiple parts separated by dots to get a field in a struct.
+
+    """
+
+    def __init__ (self, table, columnname=''):
+        self._table   = table
+        self._column  = columnname
+        self._cache   = {}
+        self._names   = None
+        self._version = table._kwversion
+
+    def _check (self):
+        # Clear the cache if the keywords have been changed.
+        if self._version != self._table._kwversion:
+            self._cache   = {}
+            self._names   = None
+            self._version = self._table._kwversion
+
+    def keys (self):
+        """Get the names of the keywords."""
+        self._check()
+        if self._names is None:
+            self._names = self._table._getfieldnames (self._column, '', -1)
+        return list(self._names)
+
+    def __len__ (self):
+        return len(self.keys())
+
+    def __iter__ (self):
+        return iter(self.keys())
+
+    def __contains__ (self, keyword):
+        return keyword in self.keys()
+
+    def has_key (self, keyword):
+        return keyword in self
+
+    def __getitem__ (self, keyword):
+        self._check()
+        if keyword in self._cache:
+            return self._cache[keyword]
+        if keyword.split('.')[0] not in self.keys():
+            raise KeyError (keyword)
+        value = self._table._getkeyword (self._column, keyword, -1)
+        self._cache[keyword] = value
+        return value
+
+    def get (self, keyword, default=None):
+        """Get the value of a keyword or the default if it does not exist."""
+        try:
+            return self[keyword]
+        except KeyError:
+            return default
+
+    def __setitem__ (self, keyword, value):
+        if self._column:
+            self._table.putcolkeyword (self._column, keyword, value)
+        else:
+            self._table.putkeyword (keyword, value)
+
+    def __delitem__ (self, keyword):
+        if keyword not in self:
+            raise KeyError (keyword)
+        if self._column:
+            self._table.removecolkeyword (self._column, keyword)
+        else:
+            self._table.removekeyword (keyword)
+
+    def todict (self):
+        """Get all keywords as a dict (as :func:`table.getkeywords`)."""
+        return self._table._getkeywords (self._column)
+
+    def __repr__ (self):
+        return repr(self.todict())
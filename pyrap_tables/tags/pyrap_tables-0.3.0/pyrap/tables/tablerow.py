@@ -27,23 +27,41 @@
 
 # Make interface to class TableRowProxy available.
 from _tables import TableRow
+from tablecolumn import _forwardslice
+import numpy
+import weakref
 
 # A normal tablerow object keeps a reference to a table object to be able
 # to know the actual number of rows.
 # However, a mutual dependency is created when doing that for the tablerow
 # object inside the table object.
 # Therefore an intermediate _tablerow exists to be used in class table.
+# It only keeps a weak reference to the table to tell it about puts.
 
 class _tablerow(TableRow):
     def __init__(self, table, columnnames, exclude=False):
         TableRow.__init__ (self, table, columnnames, exclude);
+        self._tableref = weakref.ref(table);
+        self._columnnames = list(columnnames);
+        self._exclude = exclude;
+        self._rowcols = None;
     
     def iswritable(self):
         """Tell if all columns in the row object are writable."""
         return self._iswritable()
 
-    def get (self, rownr):
-        """Get the contents of the given row."""
+    def get (self, rownr, lazy=False):
+        """Get the contents of the given row.
+
+        The row is returned as a dict. If `lazy=True`, it is returned as a
+        read-only dict-like `recordview` object that only converts a field
+        to a Python object when it is accessed. It is faster if only a few
+        fields (e.g. of a row containing large arrays) are used.
+        Its method `todict` converts it to a normal dict.
+
+        """
+        if lazy:
+            return self._getview (rownr)
         return self._get (rownr)
 
     def put (self, rownr, value, matchingfields=True):
@@ -58,39 +76,119 @@ class _tablerow(TableRow):
 
         """
         self._put (rownr, value, matchingfields)
+        self._tableref()._putdone (value.keys(), rownr);
 
-    def _getitem (self, key, nrows):
-        sei = self.checkkey (key, nrows);
-        rownr = sei[0];
+    def _columns (self, table):
+        # Derive the columns used by the row object from the table
+        # description in the same way as TableRowProxy does, so no row has
+        # to be read. If not given explicitly, all columns are used; for a
+        # writable table only the writable ones.
+        # Split them in columns that can be read as a whole and columns
+        # read cell by cell. The latter are the columns holding variable
+        # shaped arrays, string arrays (converted to a dict per cell if
+        # multi-dimensional) or records.
+        if self._rowcols is None:
+            names = self._columnnames;
+            if self._exclude  or  len(names) == 0:
+                names = [nm for nm in table.colnames()
+                         if nm not in self._columnnames];
+                if table.iswritable():
+                    names = [nm for nm in names if table._iscolwritable(nm)];
+            fixcols = [];
+            varcols = [];
+            for nm in names:
+                dtype = table.coldatatype(nm);
+                if table.isvarcol(nm)  or  dtype == 'record'  or \
+                   (dtype == 'string'  and  not table.isscalarcol(nm)):
+                    varcols.append (nm);
+                else:
+                    fixcols.append (nm);
+            self._rowcols = (fixcols, varcols);
+        return self._rowcols;
+
+    def _getrows (self, table, startrow, nrow, rowincr):
+        nrows = table.nrows();
+        if nrow < 0:
+            nrow = max(0, (nrows - startrow + rowincr - 1) / rowincr);
+        if nrow == 0:
+            return {};
+        (fixcols, varcols) = self._columns (table);
+        result = table._getcols (fixcols, startrow, nrow, rowincr);
+        for col in varcols:
+            vals = table._getvarcol (col, startrow, nrow, rowincr);
+            result[col] = [vals['r%d' % (startrow + i*rowincr + 1)]
+                           for i in range(nrow)];
+        return result;
+
+    def _putrows (self, table, value, startrow, nrow, rowincr):
+        nrows = table.nrows();
+        if nrow < 0:
+            nrow = max(0, (nrows - startrow + rowincr - 1) / rowincr);
+        if nrow == 0:
+            return;
+        (fixcols, varcols) = self._columns (table);
+        fixvals = {};
+        for col in fixcols:
+            if value.has_key(col):
+                fixvals[col] = value[col];
+        table._putcols (startrow, nrow, rowincr, fixvals);
+        for col in varcols:
+            if value.has_key(col):
+                for i in range(nrow):
+                    table._putcell (col, startrow + i*rowincr, value[col][i]);
+        table._putdone (fixcols + varcols, startrow, nrow, rowincr);
+
+    def _getitem (self, table, key):
+        sei = self.checkkey (key, table.nrows());
         if len(sei) == 1:
-            return self.get (rownr);
-        result = [];
-        inx = 0;
-        while inx < sei[1]:
-            result.append (self.get (rownr));
-            rownr += sei[2];
-            inx   += 1;
+            return self.get (sei[0]);
+        if sei[1] == 0:
+            return [];
+        # Read the rows in a single batch and split it into a dict per row.
+        # Give the same as get does, thus scalars as Python objects and a
+        # separate array per row.
+        fsei = _forwardslice (sei);
+        vals = self._getrows (table, fsei[0], fsei[1], fsei[2]);
+        result = [{} for inx in range(sei[1])];
+        for (col, val) in vals.items():
+            if isinstance(val, numpy.ndarray):
+                if val.ndim == 1:
+                    val = val.tolist();
+                else:
+                    val = [cell.copy() for cell in val];
+            for inx in range(sei[1]):
+                result[inx][col] = val[inx];
+        if sei[2] < 0:
+            result.reverse();
         return result;
     
-    def _setitem (self, key, value, nrows):
-        sei = self.checkkey (key, nrows);
+    def _setitem (self, table, key, value):
+        sei = self.checkkey (key, table.nrows());
         rownr = sei[0];
         if len(sei) == 1:
             return self.put (rownr, value);
+        if sei[1] == 0:
+            return;
         if isinstance(value, dict):
             # The same value is put in all rows.
-            inx = 0;
-            while inx < sei[1]:
-                self.put (rownr, value, True);
-                rownr += sei[2];
-                inx   += 1;
+            rownrs = range(sei[0], sei[0] + sei[1]*sei[2], sei[2]);
+            (fixcols, varcols) = self._columns (table);
+            for col in fixcols + varcols:
+                if value.has_key(col):
+                    table._putcell (col, rownrs, value[col]);
+            table._putdone (value.keys(), rownrs);
         else:
             # Each row has its own value.
             if len(value) != sei[1]:
                 raise RuntimeError("tablerow slice length differs from value length")
-            for val in value:
-                self.put (rownr, val, True);
-                rownr += sei[2];
+            fsei = _forwardslice (sei);
+            if sei[2] < 0:
+                value = value[::-1];
+            # Turn the dict per row into a sequence of values per column.
+            vals = {};
+            for col in value[0].keys():
+                vals[col] = [val[col] for val in value];
+            self._putrows (table, vals, fsei[0], fsei[1], fsei[2]);
 
     def checkkey (self, key, nrows):
         if not isinstance(key, slice):
@@ -103,7 +201,7 @@ class _tablerow(TableRow):
         if key.step != None:
             incr = key.step;
             if incr == 0:
-                raise RunTimeError("tablerow slice step cannot be zero");
+                raise RuntimeError("tablerow slice step cannot be zero");
         strow  = 0;
         endrow = nrows;
         if incr < 0:
@@ -147,9 +245,10 @@ class tablerow(_tablerow):
       tr = t.row (['ANTENNA1', 'ANTENNA2', 'ARRAY_ID'])
       tr[0]               # get row 0
       tr[:5]              # get row 0,1,2,3,4
-      tr[-5,-1,]          # get last 4 rows
-      tr[-1,-5,-1]        # get last 4 rows in reversed order
+      tr[-5:-1]           # get last 4 rows
+      tr[-1:-5:-1]        # get last 4 rows in reversed order
       tr[1] = tr[0]       # put values of row 0 into row 1
+      tr.getrows(0, 1000) # get 1000 rows as a dict of column arrays
 
     Note that the last line will fail because the table is opened readonly.
     The argument `readonly=False` is needed in the table constructor to make
@@ -160,11 +259,36 @@ class tablerow(_tablerow):
         _tablerow.__init__ (self, table, columnnames, exclude);
         self._table = table;
 
+    def getrows (self, startrow=0, nrow=-1, rowincr=1):
+        """Get the contents of multiple rows.
+
+        The rows are given by a start row (default 0), number of rows
+        (default all), and row stride (default 1).
+        Unlike the [] operator, the result is returned as a single dict
+        with a value per column, thus as a structure of arrays. The value
+        of a column is a numpy array where the first axis is formed by the
+        rows (or a list for columns holding strings or variable shaped
+        arrays). Each column is read in one go, which is much faster than
+        getting the rows one by one.
+
+        """
+        return self._getrows (self._table, startrow, nrow, rowincr);
+
+    def putrows (self, value, startrow=0, nrow=-1, rowincr=1):
+        """Put the contents of multiple rows.
+
+        The value should be a dict as returned by :func:`getrows`, thus
+        containing a sequence of values per column. Only the fields matching
+        a column name in the `tablerow` object are used.
+
+        """
+        self._putrows (self._table, value, startrow, nrow, rowincr);
+
     def __len__ (self):
         return self._table.nrows();
 
     def __getitem__ (self, key):
-        return self._getitem (key, self._table.nrows());
+        return self._getitem (self._table, key);
 
     def __setitem__ (self, key, value):
-        return self._setitem (key, value, self._table.nrows());
+        return self._setitem (self._table, key, value);
@@ -29,15 +29,401 @@
 #include <pyrap/Converters/PycBasicData.h>
 #include <pyrap/Converters/PycValueHolder.h>
 #include <pyrap/Converters/PycRecord.h>
+#include <pyrap/Converters/PycArray.h>
+#include <pyrap/Converters/PycGIL.h>
 #include <boost/python.hpp>
 #include <boost/python/args.hpp>
+#include <tables/Tables/Table.h>
+#include <tables/Tables/TableDesc.h>
+#include <tables/Tables/ScalarColumn.h>
+#include <tables/Tables/ArrayColumn.h>
+#include <tables/Tables/TiledStManAccessor.h>
+#include <casa/Arrays/ArrayMath.h>
+#include <casa/Arrays/Slicer.h>
 
 using namespace boost::python;
 
 namespace casa { namespace pyrap {
 
+  // Make a TableProxy for a reference table containing the given rows.
+  // Reading from it uses RefRows, so the data of all rows are read in a
+  // single call instead of cell by cell.
+  TableProxy rowsProxy (TableProxy& self, const Vector<Int>& rownrs)
+  {
+    Vector<uInt> rows(rownrs.size());
+    convertArray (rows, rownrs);
+    return TableProxy (self.table()(rows));
+  }
+
+  // The column data read are in a new Array, so the numpy array returned
+  // can share them instead of making a copy (see makeSharedPyArrayObject).
+  object getColumnRows (TableProxy& self, const String& columnName,
+                        const Vector<Int>& rownrs)
+  {
+    ValueHolder vh;
+    {
+      PycReleaseGIL release;
+      vh = rowsProxy(self, rownrs).getColumn (columnName, 0, -1, 1);
+    }
+    return casa_value_to_python::makeobject (vh, True);
+  }
+
+  Record getVarColumnRows (TableProxy& self, const String& columnName,
+                           const Vector<Int>& rownrs)
+  {
+    PycReleaseGIL release;
+    return rowsProxy(self, rownrs).getVarColumn (columnName, 0, -1, 1);
+  }
+
+  object getColumnSliceRows (TableProxy& self, const String& columnName,
+                             const IPosition& blc, const IPosition& trc,
+                             const IPosition& inc,
+                             const Vector<Int>& rownrs)
+  {
+    ValueHolder vh;
+    {
+      PycReleaseGIL release;
+      vh = rowsProxy(self, rownrs).getColumnSliceIP (columnName,
+                                                     blc, trc, inc, 0, -1, 1);
+    }
+    return casa_value_to_python::makeobject (vh, True);
+  }
+
+  void putColumnRows (TableProxy& self, const String& columnName,
+                      const Vector<Int>& rownrs, const ValueHolder& value)
+  {
+    PycReleaseGIL release;
+    rowsProxy(self, rownrs).putColumn (columnName, 0, -1, 1, value);
+  }
+
+  // Get the data of multiple columns in a single call.
+  Record getColumns (TableProxy& self, const Vector<String>& columnNames,
+                     Int startrow, Int nrow, Int rowincr)
+  {
+    PycReleaseGIL release;
+    Record rec;
+    for (uInt i=0; i<columnNames.size(); ++i) {
+      rec.defineFromValueHolder (columnNames[i],
+                                 self.getColumn (columnNames[i],
+                                                 startrow, nrow, rowincr));
+    }
+    return rec;
+  }
+
+  // Put the data of multiple columns (given as record fields).
+  void putColumns (TableProxy& self, Int startrow, Int nrow, Int rowincr,
+                   const Record& values)
+  {
+    PycReleaseGIL release;
+    for (uInt i=0; i<values.nfields(); ++i) {
+      self.putColumn (values.name(i), startrow, nrow, rowincr,
+                      values.asValueHolder(i));
+    }
+  }
+
+  // The following functions release the GIL while reading or writing
+  // the data, so other Python threads can continue meanwhile.
+  // Note that a table object itself cannot be used by multiple threads
+  // at the same time.
+  // The numpy arrays returned share the data read (see getColumnRows).
+  object getColumn (TableProxy& self, const String& columnName,
+                    Int startrow, Int nrow, Int rowincr)
+  {
+    ValueHolder vh;
+    {
+      PycReleaseGIL release;
+      vh = self.getColumn (columnName, startrow, nrow, rowincr);
+    }
+    return casa_value_to_python::makeobject (vh, True);
+  }
+
+  object getColumnSlice (TableProxy& self, const String& columnName,
+                         const IPosition& blc, const IPosition& trc,
+                         const IPosition& inc,
+                         Int startrow, Int nrow, Int rowincr)
+  {
+    ValueHolder vh;
+    {
+      PycReleaseGIL release;
+      vh = self.getColumnSliceIP (columnName, blc, trc, inc,
+                                  startrow, nrow, rowincr);
+    }
+    return casa_value_to_python::makeobject (vh, True);
+  }
+
+  Record getVarColumn (TableProxy& self, const String& columnName,
+                       Int startrow, Int nrow, Int rowincr)
+  {
+    PycReleaseGIL release;
+    return self.getVarColumn (columnName, startrow, nrow, rowincr);
+  }
+
+  void putColumn (TableProxy& self, const String& columnName,
+                  Int startrow, Int nrow, Int rowincr,
+                  const ValueHolder& value)
+  {
+    PycReleaseGIL release;
+    self.putColumn (columnName, startrow, nrow, rowincr, value);
+  }
+
+  void putVarColumn (TableProxy& self, const String& columnName,
+                     Int startrow, Int nrow, Int rowincr,
+                     const Record& value)
+  {
+    PycReleaseGIL release;
+    self.putVarColumn (columnName, startrow, nrow, rowincr, value);
+  }
+
+  void putColumnSlice (TableProxy& self, const String& columnName,
+                       const ValueHolder& value,
+                       const IPosition& blc, const IPosition& trc,
+                       const IPosition& inc,
+                       Int startrow, Int nrow, Int rowincr)
+  {
+    PycReleaseGIL release;
+    self.putColumnSliceIP (columnName, value, blc, trc, inc,
+                           startrow, nrow, rowincr);
+  }
+
+  // Get a string column as a fixed-width numpy string array.
+  // <group>
+  object getColumnStrings (TableProxy& self, const String& columnName,
+                           Int startrow, Int nrow, Int rowincr)
+  {
+    Array<String> arr;
+    {
+      PycReleaseGIL release;
+      arr.reference (self.getColumn (columnName, startrow, nrow, rowincr)
+                     .asArrayString());
+    }
+    return makePyStringArray (arr);
+  }
+
+  object getColumnStringsRows (TableProxy& self, const String& columnName,
+                               const Vector<Int>& rownrs)
+  {
+    Array<String> arr;
+    {
+      PycReleaseGIL release;
+      arr.reference (rowsProxy(self, rownrs).getColumn (columnName, 0, -1, 1)
+                     .asArrayString());
+    }
+    return makePyStringArray (arr);
+  }
+  // </group>
+
+  // The following functions read into an array given by the caller.
+  // That array references the data of a contiguous numpy array, so no
+  // new array has to be allocated for each read.
+  // The data type of the array must be the same as the column's and
+  // its shape must match; otherwise an exception is thrown.
+  // <group>
+  template <typename T>
+  void readColumnInto (const Table& tab, const String& columnName,
+                       Bool isScalar, const Slicer& rows,
+                       const Slicer* section, const Array<T>& out)
+  {
+    // The copy references the same data.
+    Array<T> arr(out);
+    if (isScalar) {
+      if (section != 0) {
+        throw AipsError ("Column " + columnName + " contains scalars");
+      }
+      Vector<T> vec(arr);
+      ROScalarColumn<T>(tab, columnName).getColumnRange (rows, vec, False);
+    } else if (section == 0) {
+      ROArrayColumn<T>(tab, columnName).getColumnRange (rows, arr, False);
+    } else {
+      ROArrayColumn<T>(tab, columnName).getColumnRange (rows, *section,
+                                                        arr, False);
+    }
+  }
+
+  // Make the slicer for an array section given in casacore order.
+  // Missing (leading) axes default to the full axis; so does a negative trc.
+  Slicer makeSection (const IPosition& shape, const IPosition& blc,
+                      const IPosition& trc, const IPosition& inc)
+  {
+    uInt nd = shape.size();
+    IPosition b(nd, 0);
+    IPosition t(shape - 1);
+    IPosition s(nd, 1);
+    for (uInt i=0; i<nd; ++i) {
+      Int j = Int(i) + Int(blc.size()) - Int(nd);
+      if (j >= 0  &&  j < Int(blc.size())) b[i] = blc[j];
+      j = Int(i) + Int(trc.size()) - Int(nd);
+      if (j >= 0  &&  j < Int(trc.size())  &&  trc[j] >= 0) t[i] = trc[j];
+      j = Int(i) + Int(inc.size()) - Int(nd);
+      if (j >= 0  &&  j < Int(inc.size())) s[i] = inc[j];
+    }
+    return Slicer (b, t, s, Slicer::endIsLast);
+  }
+
+  void readColumnInto (const Table& tab, const String& columnName,
+                       const IPosition& blc, const IPosition& trc,
+                       const IPosition& inc, const Slicer& rows,
+                       const ValueHolder& out)
+  {
+    const ColumnDesc& cdesc = tab.tableDesc()[columnName];
+    Bool isScalar = cdesc.isScalar();
+    Slicer section;
+    Slicer* sectionPtr = 0;
+    if (blc.size() + trc.size() + inc.size() > 0) {
+      IPosition shape = cdesc.shape();
+      if (shape.empty()  &&  tab.nrow() > 0) {
+        shape = ROTableColumn(tab, columnName).shape (rows.start()[0]);
+      }
+      section = makeSection (shape, blc, trc, inc);
+      sectionPtr = &section;
+    }
+    DataType dtype = cdesc.dataType();
+    if (out.dataType() != asArray(dtype)) {
+      throw AipsError ("Data type of output array mismatches column "
+                       + columnName);
+    }
+    switch (dtype) {
+    case TpBool:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayBool());
+      break;
+    case TpShort:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayShort());
+      break;
+    case TpUShort:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayuShort());
+      break;
+    case TpInt:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayInt());
+      break;
+    case TpUInt:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayuInt());
+      break;
+    case TpFloat:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayFloat());
+      break;
+    case TpDouble:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayDouble());
+      break;
+    case TpComplex:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayComplex());
+      break;
+    case TpDComplex:
+      readColumnInto (tab, columnName, isScalar, rows, sectionPtr,
+                      out.asArrayDComplex());
+      break;
+    default:
+      throw AipsError ("Reading column " + columnName +
+                       " into an output array is not supported");
+    }
+  }
+
+  void getColumnOut (TableProxy& self, const String& columnName,
+                     const IPosition& blc, const IPosition& trc,
+                     const IPosition& inc,
+                     Int startrow, Int nrow, Int rowincr,
+                     const ValueHolder& out)
+  {
+    PycReleaseGIL release;
+    const Table& tab = self.table();
+    if (rowincr <= 0) rowincr = 1;
+    if (nrow < 0) {
+      nrow = (Int(tab.nrow()) - startrow + rowincr - 1) / rowincr;
+    }
+    Slicer rows (IPosition(1, startrow), IPosition(1, nrow),
+                 IPosition(1, rowincr));
+    readColumnInto (tab, columnName, blc, trc, inc, rows, out);
+  }
+
+  void getColumnRowsOut (TableProxy& self, const String& columnName,
+                         const IPosition& blc, const IPosition& trc,
+                         const IPosition& inc, const Vector<Int>& rownrs,
+                         const ValueHolder& out)
+  {
+    PycReleaseGIL release;
+    Table tab = rowsProxy(self, rownrs).table();
+    Slicer rows (IPosition(1, 0), IPosition(1, tab.nrow()));
+    readColumnInto (tab, columnName, blc, trc, inc, rows, out);
+  }
+  // </group>
+
+  // Execute a TaQL command and return the result without making a table
+  // object in Python. The record contains the field 'values' for a CALC
+  // command. Otherwise it contains a subrecord 'columns' with the data of
+  // each column in the result table (a record per row if the column holds
+  // arrays with different shapes).
+  Record taqlColumns (const String& command,
+                      const std::vector<TableProxy>& tables)
+  {
+    PycReleaseGIL release;
+    TableProxy result (command, tables);
+    Record calc = result.getCalcResult();
+    if (calc.nfields() > 0) {
+      return calc;
+    }
+    Record columns;
+    Vector<String> names = result.columnNames();
+    for (uInt i=0; i<names.size(); ++i) {
+      try {
+        columns.defineFromValueHolder
+          (names[i], result.getColumn (names[i], 0, -1, 1));
+      } catch (const AipsError&) {
+        columns.defineRecord
+          (names[i], result.getVarColumn (names[i], 0, -1, 1));
+      }
+    }
+    Record rec;
+    rec.defineRecord ("columns", columns);
+    return rec;
+  }
+
+  // Tell if a column can be written. It is used to find the columns of
+  // a row object on a writable table.
+  Bool isColumnWritable (TableProxy& self, const String& columnName)
+  {
+    return self.table().isColumnWritable (columnName);
+  }
+
+  // Get the names of the tables making up the table. If recursive, the
+  // names of the root tables are given (e.g. the referenced table of a
+  // reference table).
+  Vector<String> getPartNames (TableProxy& self, Bool recursive)
+  {
+    return Vector<String> (self.table().getPartNames (recursive));
+  }
+
+  // Get the memory (in bytes) currently used by the tile caches of the
+  // tiled storage managers in the table. A cache grows when tiles are
+  // accessed, so the result depends on the access pattern so far.
+  Double tileCacheMemory (TableProxy& self)
+  {
+    const Table& tab = self.table();
+    Record dminfo = tab.dataManagerInfo();
+    Double nbytes = 0;
+    for (uInt i=0; i<dminfo.nfields(); ++i) {
+      const Record& dm = dminfo.subRecord(i);
+      if (dm.asString("TYPE").contains ("Tiled")) {
+        ROTiledStManAccessor acc (tab, dm.asString("NAME"));
+        for (uInt j=0; j<acc.nhypercubes(); ++j) {
+          nbytes += Double(acc.cacheSize(j)) * acc.bucketSize(j);
+        }
+      }
+    }
+    return nbytes;
+  }
+
   void pytable()
   {
+    def ("_taqlcolumns", &taqlColumns,
+         (boost::python::arg("command"),
+          boost::python::arg("tables")));
+
     // Note that all constructors must have a different number of arguments.
     class_<TableProxy> ("Table",
             init<TableProxy>())
@@ -103,6 +489,9 @@ namespace casa { namespace pyrap {
  	    (boost::python::arg("value")))
       .def ("_addreadmeline", &TableProxy::addReadmeLine,
  	    (boost::python::arg("value")))
+      .def ("_tilecachememory", &tileCacheMemory)
+      .def ("_partnames", &getPartNames,
+	    (boost::python::arg("recursive")))
       .def ("_setmaxcachesize", &TableProxy::setMaximumCacheSize,
 	    (boost::python::arg("columnname"),
 	     boost::python::arg("nbytes")))
@@ -111,6 +500,8 @@ namespace casa { namespace pyrap {
       .def ("_colnames", &TableProxy::columnNames)
       .def ("_isscalarcol", &TableProxy::isScalarColumn,
 	    (boost::python::arg("columnname")))
+      .def ("_iscolwritable", &isColumnWritable,
+	    (boost::python::arg("columnname")))
       .def ("_coldatatype", &TableProxy::columnDataType,
 	    (boost::python::arg("columnname")))
       .def ("_colarraytype", &TableProxy::columnArrayType,
@@ -142,17 +533,52 @@ namespace casa { namespace pyrap {
 	     boost::python::arg("blc"),
 	     boost::python::arg("trc"),
 	     boost::python::arg("inc")))
-      .def ("_getcol", &TableProxy::getColumn,
+      .def ("_getcol", &getColumn,
+	    (boost::python::arg("columnname"),
+	     boost::python::arg("startrow"),
+	     boost::python::arg("nrow"),
+	     boost::python::arg("rowincr")))
+      .def ("_getcolrows", &getColumnRows,
 	    (boost::python::arg("columnname"),
+	     boost::python::arg("rownrs")))
+      .def ("_getvarcol", &getVarColumn,
+	    (boost::python::arg("columnname"),
+	     boost::python::arg("startrow"),
+	     boost::python::arg("nrow"),
+	     boost::python::arg("rowincr")))
+      .def ("_getcols", &getColumns,
+	    (boost::python::arg("columnnames"),
 	     boost::python::arg("startrow"),
 	     boost::python::arg("nrow"),
 	     boost::python::arg("rowincr")))
-      .def ("_getvarcol", &TableProxy::getVarColumn,
+      .def ("_getvarcolrows", &getVarColumnRows,
+	    (boost::python::arg("columnname"),
+	     boost::python::arg("rownrs")))
+      .def ("_getcolstr", &getColumnStrings,
 	    (boost::python::arg("columnname"),
 	     boost::python::arg("startrow"),
 	     boost::python::arg("nrow"),
 	     boost::python::arg("rowincr")))
-      .def ("_getcolslice", &TableProxy::getColumnSliceIP,
+      .def ("_getcolstrrows", &getColumnStringsRows,
+	    (boost::python::arg("columnname"),
+	     boost::python::arg("rownrs")))
+      .def ("_getcolout", &getColumnOut,
+	    (boost::python::arg("columnname"),
+	     boost::python::arg("blc"),
+	     boost::python::arg("trc"),
+	     boost::python::arg("inc"),
+	     boost::python::arg("startrow"),
+	     boost::python::arg("nrow"),
+	     boost::python::arg("rowincr"),
+	     boost::python::arg("out")))
+      .def ("_getcolrowsout", &getColumnRowsOut,
+	    (boost::python::arg("columnname"),
+	     boost::python::arg("blc"),
+	     boost::python::arg("trc"),
+	     boost::python::arg("inc"),
+	     boost::python::arg("rownrs"),
+	     boost::python::arg("out")))
+      .def ("_getcolslice", &getColumnSlice,
 	    (boost::python::arg("columnname"),
 	     boost::python::arg("blc"),
 	     boost::python::arg("trc"),
@@ -160,6 +586,12 @@ namespace casa { namespace pyrap {
 	     boost::python::arg("startrow"),
 	     boost::python::arg("nrow"),
 	     boost::python::arg("rowincr")))
+      .def ("_getcolslicerows", &getColumnSliceRows,
+	    (boost::python::arg("columnname"),
+	     boost::python::arg("blc"),
+	     boost::python::arg("trc"),
+	     boost::python::arg("inc"),
+	     boost::python::arg("rownrs")))
       .def ("_putcell", &TableProxy::putCell,
 	    (boost::python::arg("columnname"),
 	     boost::python::arg("rownr"),
@@ -171,19 +603,28 @@ namespace casa { namespace pyrap {
 	     boost::python::arg("blc"),
 	     boost::python::arg("trc"),
 	     boost::python::arg("inc")))
-      .def ("_putcol", &TableProxy::putColumn,
+      .def ("_putcol", &putColumn,
 	    (boost::python::arg("columnname"),
 	     boost::python::arg("startrow"),
 	     boost::python::arg("nrow"),
 	     boost::python::arg("rowincr"),
 	     boost::python::arg("value")))
-      .def ("_putvarcol", &TableProxy::putVarColumn,
+      .def ("_putcolrows", &putColumnRows,
+	    (boost::python::arg("columnname"),
+	     boost::python::arg("rownrs"),
+	     boost::python::arg("value")))
+      .def ("_putcols", &putColumns,
+	    (boost::python::arg("startrow"),
+	     boost::python::arg("nrow"),
+	     boost::python::arg("rowincr"),
+	     boost::python::arg("value")))
+      .def ("_putvarcol", &putVarColumn,
 	    (boost::python::arg("columnname"),
 	     boost::python::arg("startrow"),
 	     boost::python::arg("nrow"),
 	     boost::python::arg("rowincr"),
 	     boost::python::arg("value")))
-      .def ("_putcolslice", &TableProxy::putColumnSliceIP,
+      .def ("_putcolslice", &putColumnSlice,
 	    (boost::python::arg("columnname"),
 	     boost::python::arg("value"),
 	     boost::python::arg("blc"),
@@ -29,6 +29,9 @@
 #include <tables/Tables/TableProxy.h>
 #include <pyrap/Converters/PycBasicData.h>
 #include <pyrap/Converters/PycRecord.h>
+#include <casa/Arrays/Vector.h>
+#include <casa/Containers/Block.h>
+#include <casa/Utilities/Assert.h>
 #include <boost/python.hpp>
 #include <boost/python/args.hpp>
 
@@ -36,6 +39,101 @@ using namespace boost::python;
 
 namespace casa { namespace pyrap {
 
+  // Define a field in the key as the k-th value in the key array.
+  template<typename T>
+  void defineKeyValue (Record& key, const String& name,
+                       const Array<T>& values, uInt k)
+  {
+    key.define (name, values.data()[k]);
+  }
+
+  // Fill the key record with the k-th values of the key arrays.
+  void makeKey (Record& key, const Record& keys, uInt k)
+  {
+    for (uInt i=0; i<keys.nfields(); ++i) {
+      switch (keys.dataType(i)) {
+      case TpArrayBool:
+        defineKeyValue (key, keys.name(i), keys.asArrayBool(i), k);
+        break;
+      case TpArrayUChar:
+        defineKeyValue (key, keys.name(i), keys.asArrayuChar(i), k);
+        break;
+      case TpArrayShort:
+        defineKeyValue (key, keys.name(i), keys.asArrayShort(i), k);
+        break;
+      case TpArrayInt:
+        defineKeyValue (key, keys.name(i), keys.asArrayInt(i), k);
+        break;
+      case TpArrayUInt:
+        defineKeyValue (key, keys.name(i), keys.asArrayuInt(i), k);
+        break;
+      case TpArrayFloat:
+        defineKeyValue (key, keys.name(i), keys.asArrayFloat(i), k);
+        break;
+      case TpArrayDouble:
+        defineKeyValue (key, keys.name(i), keys.asArrayDouble(i), k);
+        break;
+      case TpArrayComplex:
+        defineKeyValue (key, keys.name(i), keys.asArrayComplex(i), k);
+        break;
+      case TpArrayDComplex:
+        defineKeyValue (key, keys.name(i), keys.asArrayDComplex(i), k);
+        break;
+      case TpArrayString:
+        defineKeyValue (key, keys.name(i), keys.asArrayString(i), k);
+        break;
+      default:
+        throw AipsError ("Key field " + keys.name(i) +
+                         " must be an array of values");
+      }
+    }
+  }
+
+  // Look up many keys at once. Each field in keys is an array containing
+  // the values of a key column. If unique=True, a record containing the
+  // row number of each key (-1 if not found) is returned. Otherwise the
+  // record also contains the offsets of the row numbers of each key.
+  Record getRowNumbersMany (TableIndexProxy& self, const Record& keys,
+                            Bool unique)
+  {
+    uInt nkey = 0;
+    for (uInt i=0; i<keys.nfields(); ++i) {
+      uInt n = keys.shape(i).product();
+      AlwaysAssert (i == 0  ||  n == nkey, AipsError);
+      nkey = n;
+    }
+    Record key;
+    Record result;
+    if (unique) {
+      Vector<Int> rownrs(nkey);
+      for (uInt k=0; k<nkey; ++k) {
+        makeKey (key, keys, k);
+        rownrs[k] = self.getRowNumber (key);
+      }
+      result.define ("rownrs", rownrs);
+    } else {
+      Vector<Int> offsets(nkey+1);
+      Block<Vector<Int> > found(nkey);
+      uInt nrow = 0;
+      for (uInt k=0; k<nkey; ++k) {
+        makeKey (key, keys, k);
+        found[k].reference (self.getRowNumbers (key));
+        offsets[k] = nrow;
+        nrow += found[k].size();
+      }
+      offsets[nkey] = nrow;
+      Vector<Int> rownrs(nrow);
+      for (uInt k=0; k<nkey; ++k) {
+        for (uInt j=0; j<found[k].size(); ++j) {
+          rownrs[offsets[k] + j] = found[k][j];
+        }
+      }
+      result.define ("rownrs", rownrs);
+      result.define ("offsets", offsets);
+    }
+    return result;
+  }
+
   void pytableindex()
   {
     class_<TableIndexProxy> ("TableIndex",
@@ -47,6 +145,7 @@ namespace casa { namespace pyrap {
       .def ("_rownr", &TableIndexProxy::getRowNumber)
       .def ("_rownrs", &TableIndexProxy::getRowNumbers)
       .def ("_rownrsrange", &TableIndexProxy::getRowNumbersRange)
+      .def ("_rownrsmany", &getRowNumbersMany)
       ;
   }
     
@@ -36,6 +36,13 @@ using namespace boost::python;
 
 namespace casa { namespace pyrap {
 
+  // Get a row as a lazy record view, so only the fields accessed
+  // are converted to Python objects.
+  PycRecordView getView (TableRowProxy& self, Int rownr)
+  {
+    return PycRecordView (self.get (rownr));
+  }
+
   void pytablerow()
   {
     class_<TableRowProxy> ("TableRow",
@@ -44,6 +51,8 @@ namespace casa { namespace pyrap {
       .def ("_iswritable", &TableRowProxy::isWritable)
       .def ("_get", &TableRowProxy::get,
 	    (boost::python::arg("rownr")))
+      .def ("_getview", &getView,
+	    (boost::python::arg("rownr")))
       .def ("_put", &TableRowProxy::put,
 	    (boost::python::arg("rownr"),
 	     boost::python::arg("value"),
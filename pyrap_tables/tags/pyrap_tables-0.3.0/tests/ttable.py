@@ -54,6 +54,9 @@ t.putcell('colarrtsm', 0, numpy.array([[1,2,3],[4,5,6]]))
 t.putcell('colarrtsm', 1, t.getcell('colarrtsm',0)+10)
 print t.getcol('colarrtsm')
 print t.getcellslice('colarrtsm', 0, [1,1], [1,2])
+# Get a string column as a fixed-width numpy array.
+t.putcol('cols', ['ab', 'cde'])
+print t.getcol('cols', stringarray=True)
 
 # Do keyword handling
 t.putkeyword ('key1', "keyval")
@@ -64,6 +67,11 @@ print t.keywordnames()
 print t.fieldnames()
 print t.fieldnames('keyrec')
 print t.getcolkeywords('coli')
+# Lazy keyword access; the cache is cleared by putkeyword
+kw = t.getkeywords(lazy=True)
+print kw['keyrec'], len(kw), 'key1' in kw
+t.putkeyword ('keyrec.skey1', 2)
+print kw['keyrec.skey1'], kw['keyrec']['skey1']
 
 # Delete some columns.
 t.removecols(['colarr','colarrssm','cols','colb','colc','coli2'])
@@ -88,11 +96,29 @@ for i in range(2,22):
 # Table iteration
 for iter in t.iter('coli'):
     print iter.getcol('coli'), iter.rownumbers(t)
+# Apply a function to the iteration groups in parallel processes
+def ngroup (ts):
+    return ts.nrows()
+t.flush()
+print t.parallel_iter('coli', ngroup, 2)
+print t.query('coli < 4').parallel_iter('coli', ngroup, 2)
+tm = table ("ttable.py_tmp.mem", maketabdesc(makescacoldesc("coli", 0)),
+            nrow=2, memorytable=True, ack=False)
+try:
+    tm.parallel_iter('coli', ngroup, 2)
+    print 'parallel_iter of a memory table succeeded'
+except RuntimeError:
+    print 'parallel_iter of a memory table failed'
+# Group the rows without making reference tables
+keys, offsets, rownrs = t.groupby('coli')
+print keys['coli'], offsets
+print rownrs
 # Table column
 tc = tablecolumn(t,'coli');
 tc[6] += 20
 print tc[18:4:-2]
 print tc[0:]
+print tc[numpy.array([True,False]*11)]
 # Table index
 ti = t.index('coli')
 print ti.isunique(), ti.colnames()
@@ -102,3 +128,136 @@ print ti.rownrs(2)
 print ti.rownrs(2,7)                   # include borders
 print ti.rownrs(2,7,False,False)       # exclude borders
 print ti[2:7]                          # exclude end
+rownrs, offsets = ti.rownrs_many(numpy.array([2,23,20]))
+print rownrs, offsets
+# Hash index
+hi = t.index('coli', hashed=True)
+print hi.isunique(), hi.rownrs(2), hi.rownrs(20), len(hi)
+# The indexes are updated when the table changes
+t.putcell('coli', 2, 20)
+print hi.rownrs(20), ti.rownrs(20)
+t.putcell('coli', 2, 1)
+print hi.rownrs(1), ti.rownrs(1)
+t[2] = {'coli': 20}
+print hi.rownrs(20), ti.rownrs(20)
+t[2] = {'coli': 1}
+# Changes via a reference table or a TaQL command are seen by the indexes
+tq = t.query('coli == 1')
+tq.putcell('coli', 0, 20)
+print hi.rownrs(20), ti.rownrs(20)
+taql('update $t set coli=1 where coli==20')
+print hi.rownrs(1), ti.rownrs(1)
+# Index stored in the table directory
+fi = t.index('coli', persistent=True)
+print fi.isunique(), fi.rownrs(2), fi[2:7]
+# Index stored in another directory
+import os
+if not os.path.isdir('ttable.py_tmp.inx'):
+    os.mkdir('ttable.py_tmp.inx')
+fi = t.index('coli', persistent=True, directory='ttable.py_tmp.inx')
+print fi.rownrs(2), len(os.listdir('ttable.py_tmp.inx'))
+# TaQL query using python variables
+v = 23
+print taql('select from $t where coli == $v').nrows()
+# TaQL selection result as a dict of arrays
+res = taql('select coli from $t where coli == 2', asdict=True)
+print res.keys(), res['coli']
+# Page through a query result
+cur = t.querycursor('coli < 3', columns='coli', pagesize=2)
+print len(cur), cur.npages(), [page['coli'].tolist() for page in cur]
+# Cached query result
+t1 = t.query('coli < 3', cache=True)
+t2 = t.query('coli < 3', cache=True)
+print t1.nrows(), t2.rownumbers(t)
+# The cached result is not used after a change via another table object
+t1.putcell('coli', 0, 30)
+print t.query('coli < 3', cache=True).rownumbers(t)
+taql('update $t set coli=2 where coli==30')
+print t.query('coli < 3', cache=True).rownumbers(t)
+tb = table(t.name(), readonly=False, ack=False)
+tb.putcell('coli', 1, 30)
+print t.query('coli < 3', cache=True).rownumbers(t)
+tb.putcell('coli', 1, 2)
+tb.close()
+# Get column data for a vector of row numbers
+print t.getcol('coli', [3,0,6])
+# Get multiple rows as a dict of column arrays
+print t.row(['coli']).getrows(0, 3)
+# Read a concatenation of tables in multiple threads
+tdc = maketabdesc((makescacoldesc("coli", 0),
+                   makescacoldesc("coluc", 0, valuetype='uchar'),
+                   makearrcoldesc("colarr", 0., shape=[2])))
+for i in range(3):
+    tc = table ("ttable.py_tmp.tabc%d" % i, tdc, nrow=2+i, ack=False)
+    tc.putcol ('coli', range(10*i, 10*i+2+i))
+    tc.putcol ('coluc', range(10*i, 10*i+2+i))
+    tc.putcol ('colarr', numpy.ones((2+i,2)) * i)
+    tc.close()
+tc = table (["ttable.py_tmp.tabc0", "ttable.py_tmp.tabc1",
+             "ttable.py_tmp.tabc2"], concatthreads=2, ack=False)
+print tc.getcol('coli'), tc.getcol('coli', 1, 4, 2)
+print tc.getcol('coluc', 1, 6)
+print tc.getcolslice('colarr', [1], [1], [], 1, 4)[:,0]
+print tc.getcol('colarr')[:,1]
+try:
+    tc.getcol('coli', 0, 100)
+    print 'getcol beyond the end succeeded'
+except RuntimeError:
+    print 'getcol beyond the end failed'
+tc.close()
+# Get and put a slice of rows with a fixed-shape string array column
+t3 = table ("ttable.py_tmp.tab2",
+            maketabdesc((makescacoldesc("coli", 0),
+                         makearrcoldesc("colsarr", "", shape=[2,2]))),
+            nrow=3, ack=False)
+t3.putcell ('colsarr', 1, {'shape':[2,2], 'array':['a','b','c','d']})
+rows = t3[0:3]
+print len(rows), rows[1]['colsarr']['shape'], rows[1]['colsarr']['array']
+t3[1:3:1] = [rows[2], rows[1]]
+print t3[2]['colsarr']['array'], t3.getcell('colsarr', 1)['array']
+# A cached query result is invalidated by a put
+print t3.query('any(colsarr == "x")', cache=True).nrows(),
+t3.putcellslice ('colsarr', 0, {'shape':[1,1], 'array':['x']}, [0,0], [0,0])
+print t3.query('any(colsarr == "x")', cache=True).nrows()
+t3.close()
+# A row slice gives the same as getting the rows one by one
+t4 = table ("ttable.py_tmp.tab3",
+            maketabdesc((makescacoldesc("coli", 0),
+                         makescacoldesc("cols", ""),
+                         makearrcoldesc("colarr", 0., shape=[2]))),
+            nrow=4, ack=False)
+t4.putcol ('coli', [1,2,3,4])
+t4.putcol ('cols', ['a','b','c','d'])
+t4.putcol ('colarr', numpy.arange(8.).reshape(4,2))
+rows = t4[1:4]
+print repr([sorted(r.items()) for r in rows]) == \
+      repr([sorted(t4[k].items()) for k in range(1,4)])
+rows[0]['colarr'][0] = 10
+print type(rows[0]['coli']), type(rows[0]['cols']), rows[1]['colarr']
+t4.close()
+# Iterate through the table in chunks of rows
+for chunk in t.iterchunks('coli', 8):
+    print chunk['coli']
+print [len(chunk['coli']) for chunk in t.iterchunks('coli', 8, prefetch=True)]
+# Break out of a prefetching iteration and use the table again
+for chunk in t.iterchunks('coli', 2, prefetch=True):
+    break
+print chunk['coli'], t.getcol('coli', 2, 2)
+# Read column data into a preallocated array
+buf = numpy.zeros(4, 'int32')
+t.getcol('coli', 2, 4, out=buf)
+print buf
+# Get a row as a lazy record view
+rv = t.row(['coli']).get(0, lazy=True)
+print len(rv), rv['coli'], rv.keys(), 'coli' in rv
+# Cache open tables
+tcache = tablecache(maxtables=1)
+t2 = tcache.open('ttable.py_tmp.tab1')
+print tcache.open('ttable.py_tmp.tab1') is t2, len(tcache), 'ttable.py_tmp.tab1' in tcache
+tcache.close('ttable.py_tmp.tab1')
+print len(tcache)
+# Tables are removed from the cache if their caches use too much memory
+mcache = tablecache(maxmemory=1)
+mcache.open('ttable.py_tmp.tab1')
+mcache.open('ttable.py_tmp.tabc0')
+print len(mcache), 'ttable.py_tmp.tabc0' in mcache
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+# Test pyrap.tables.aio. It needs asyncio (or trollius on Python 2).
+
+from pyrap.tables import *
+from pyrap.util.aio import asyncio
+import numpy
+import sys
+
+if asyncio is None:
+    print 'asyncio is not available'
+    sys.exit(0)
+import pyrap.tables.aio as taio
+
+# Make two tables
+td = maketabdesc((makescacoldesc("coli", 0),
+                  makearrcoldesc("colarr", 0., shape=[2])))
+t0 = table ("ttableaio.py_tmp.tab0", td, nrow=2, ack=False)
+t0.putcol ('coli', [0,1])
+t1 = table ("ttableaio.py_tmp.tab1", td, nrow=3, ack=False)
+t1.putcol ('coli', [10,11,12])
+loop = asyncio.get_event_loop()
+# Calls on the same table are done in order
+futs = [taio.getcol (t0, 'coli'), taio.putcol (t0, 'coli', [5,6]),
+        taio.getcell (t0, 'coli', 1), taio.getcol (t1, 'coli', 1, 2)]
+res = loop.run_until_complete (asyncio.gather (*futs))
+print res[0], res[2], res[3]
+# An exception is passed on and does not block later calls
+try:
+    loop.run_until_complete (taio.getcell (t0, 'colx', 0))
+    print 'getcell of unknown column succeeded'
+except RuntimeError:
+    print 'getcell of unknown column failed'
+print loop.run_until_complete (taio.getcolslice (t0, 'colarr', [1], [1]))
+t0.close()
+t1.close()
@@ -2,3 +2,4 @@
 Utilities for pyrap modules.
 """
 from substitute import substitute, getlocals, getvariable
+from substitute import parsesubstitute, substituteparts
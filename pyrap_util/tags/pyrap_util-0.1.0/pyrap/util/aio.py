@@ -0,0 +1,190 @@
+# aio.py: run blocking pyrap calls for asyncio
+# Copyright (C) 2010
+# Associated Universities, Inc. Washington DC, USA.
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Library General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or (at your
+# option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Library General Public
+# License for more details.
+#
+# You should have received a copy of the GNU Library General Public License
+# along with this library; if not, write to the Free Software Foundation,
+# Inc., 675 Massachusetts Ave, Cambridge, MA 02139, USA.
+#
+# Correspondence concerning AIPS++ should be addressed as follows:
+#        Internet email: aips2-request@nrao.edu.
+#        Postal address: AIPS++ Project Office
+#                        National Radio Astronomy Observatory
+#                        520 Edgemont Road
+#                        Charlottesville, VA 22903-2475 USA
+#
+# $Id$
+
+"""Run blocking pyrap calls in a bounded thread pool for asyncio.
+
+It is used by :mod:`pyrap.tables.aio` and :mod:`pyrap.images.aio`.
+The C++ functions reading and writing data release the GIL, so multiple
+calls can run at the same time while the event loop keeps running.
+A casacore table or image object cannot be used by multiple threads at the
+same time. Therefore calls on the same object are queued in the event loop
+and submitted to the thread pool one after another; calls on different
+objects run concurrently (up to the maximum number of workers).
+
+The standard `asyncio` module is used. On Python 2 the `trollius` backport
+is used if installed. Neither is needed to use the rest of pyrap.
+
+"""
+
+try:
+    import asyncio
+except ImportError:
+    try:
+        import trollius as asyncio
+    except ImportError:
+        asyncio = None
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+import threading
+
+_maxworkers = 4
+_pool       = None
+_pending    = {}
+_lock       = threading.Lock()
+
+
+class _threadpool(object):
+    # A minimal pool of daemon threads executing the calls put in its queue.
+    # The threads are started when needed.
+    def __init__ (self, nworkers):
+        self._nworkers = nworkers
+        self._queue    = queue.Queue()
+        self._threads  = []
+
+    def submit (self, call):
+        self._queue.put (call)
+        if len(self._threads) < self._nworkers:
+            thr = threading.Thread (target=self._work)
+            thr.setDaemon (True)
+            thr.start()
+            self._threads.append (thr)
+
+    def shutdown (self):
+        # Let the threads end after the calls already submitted.
+        for thr in self._threads:
+            self._queue.put (None)
+        self._threads = []
+
+    def _work (self):
+        while True:
+            call = self._queue.get()
+            if call is None:
+                return
+            call()
+
+
+def setmaxworkers (nworkers):
+    """Set the maximum number of threads used to run the calls.
+
+    The default is 4. Calls already submitted are finished by the old
+    threads.
+
+    """
+    global _maxworkers, _pool
+    _lock.acquire()
+    try:
+        _maxworkers = nworkers
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+    finally:
+        _lock.release()
+
+def _submit (call):
+    # Submit a call to the thread pool (created if needed).
+    global _pool
+    _lock.acquire()
+    try:
+        if _pool is None:
+            _pool = _threadpool (_maxworkers)
+        _pool.submit (call)
+    finally:
+        _lock.release()
+
+def _start (obj, loop, future, func, args, kwargs):
+    # Run the call in a thread and set its future in the event loop.
+    # Thereafter the next call queued for the object is started.
+    def done (result, exc):
+        try:
+            if not future.done():
+                if exc is None:
+                    future.set_result (result)
+                else:
+                    future.set_exception (exc)
+        finally:
+            _next (obj)
+    def call ():
+        # Also pass on exceptions like KeyboardInterrupt, otherwise the
+        # future would never be done and the object's queue would be stuck.
+        result = None
+        exc = None
+        try:
+            result = func (*args, **kwargs)
+        except BaseException as e:
+            exc = e
+        try:
+            loop.call_soon_threadsafe (done, result, exc)
+        except RuntimeError:
+            # The event loop is closed; still start the next call.
+            _next (obj)
+    if future.cancelled():
+        _next (obj)
+    else:
+        _submit (call)
+
+def _next (obj):
+    # Start the next call queued for the object, if any.
+    _lock.acquire()
+    try:
+        calls = _pending[id(obj)][1]
+        if len(calls) == 0:
+            del _pending[id(obj)]
+            return
+        callargs = calls.pop(0)
+    finally:
+        _lock.release()
+    _start (*callargs)
+
+def run (obj, func, *args, **kwargs):
+    """Call func(*args, **kwargs) for the given table or image object.
+
+    The function is called in a thread of the pool. It returns an
+    asyncio future giving the result of the function.
+    If a call on the same object is still busy, the call is queued in the
+    event loop, so it does not occupy a thread while waiting.
+
+    """
+    if asyncio is None:
+        raise ImportError("pyrap.util.aio needs asyncio (or trollius on Python 2)")
+    loop = asyncio.get_event_loop()
+    future = asyncio.Future (loop=loop)
+    callargs = (obj, loop, future, func, args, kwargs)
+    # The object is kept alive while calls for it are pending.
+    _lock.acquire()
+    try:
+        entry = _pending.get (id(obj))
+        if entry is None:
+            _pending[id(obj)] = (obj, [])
+        else:
+            entry[1].append (callargs)
+            return future
+    finally:
+        _lock.release()
+    _start (*callargs)
+    return future
@@ -24,7 +24,8 @@
 #                        Charlottesville, VA 22903-2475 USA
 #
 # $Id: substitute.py 226 2009-11-12 03:39:30Z Malte.Marquarding $
-__all__ = ['getlocals', 'getvariable', 'substitute']
+__all__ = ['getlocals', 'getvariable', 'substitute', 'parsesubstitute',
+           'substituteparts']
 
 
 def getlocals(back=2):
@@ -105,7 +106,23 @@ def substitute(s, objlist=(), globals={}, locals={}):
     Substitution is NOT recursive. E.g. if a=1 and b="$a",
     the result of substitute("$b") is "$a" and not 1.
 
+    The string is parsed by :func:`parsesubstitute` and the substitution
+    is done by :func:`substituteparts`. They can be used directly to
+    substitute the same string many times.
+
     """
+    return substituteparts(parsesubstitute(s), objlist, globals, locals)
+
+
+def parsesubstitute(s):
+    """Parse a command string into parts for :func:`substituteparts`.
+
+    It returns a list of tuples `(kind, text)`, where kind 0 is a literal
+    part, 1 is the name of a variable (`$name`), and 2 is an expression
+    (`$(expression)`). The same rules as in :func:`substitute` apply.
+
+    """
+    parts = []
     # Split the string into its individual characters.
     # Initialize some variables.
     backslash = False
@@ -137,9 +154,12 @@ def substitute(s, objlist=(), globals={}, locals={}):
                         tmp = ''
                         dollar = False
                     else:
-                        # End of name found. Try to substitute.
+                        # End of name found. It has to be substituted.
                         dollar = False
-                        out += substitutename(name, objlist, globals, locals)
+                        if out:
+                            parts.append((0, out))
+                            out = ''
+                        parts.append((1, name))
 
         if tmp != '':
             # Handle possible single or double quotes.
@@ -161,11 +181,12 @@ def substitute(s, objlist=(), globals={}, locals={}):
                                     nparen -= 1
                                     if nparen == 0:
                                         # The last closing parenthese is found.
-                                        # Evaluate the subexpression and if
-                                        # successful  put the result in the
-                                        # output.
-                                        out += substituteexpr(evalstr, globals,
-                                                              locals)
+                                        # The subexpression has to be
+                                        # evaluated.
+                                        if out:
+                                            parts.append((0, out))
+                                            out = ''
+                                        parts.append((2, evalstr))
                                         tmp = ''
                         else:
                             # Set a switch if we have a dollar (outside quoted
@@ -188,10 +209,33 @@ def substitute(s, objlist=(), globals={}, locals={}):
         # Substitute a possible last name.
         # Insert a possible incomplete eval string as such.
     if dollar:
-        out += substitutename(name, objlist, globals, locals)
+        if out:
+            parts.append((0, out))
+            out = ''
+        parts.append((1, name))
     else:
         if nparen > 0:
             out += '$(' + evalstr
+    if out:
+        parts.append((0, out))
+    return parts
+
+
+def substituteparts(parts, objlist=(), globals={}, locals={}):
+    """Substitute the variables in a command parsed by :func:`parsesubstitute`.
+
+    The arguments `objlist`, `globals`, and `locals` have the same meaning
+    as in :func:`substitute`.
+
+    """
+    out = ''
+    for kind, text in parts:
+        if kind == 0:
+            out += text
+        elif kind == 1:
+            out += substitutename(text, objlist, globals, locals)
+        else:
+            out += substituteexpr(text, globals, locals)
     return out
 
 
@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-from pyrap.util import substitute
+from pyrap.util import substitute, parsesubstitute, substituteparts
 
 def f1(arg):
     a=3
@@ -15,3 +15,6 @@ print "a=%d, b=%d, %s => %s" % (a, b, p, s)
 
 f1(23)
 f1('xyz')
+
+parts = parsesubstitute ('$a+$(a*b) "$a"')
+print parts, substituteparts (parts, locals=locals())